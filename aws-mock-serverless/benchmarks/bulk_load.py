@@ -0,0 +1,76 @@
+"""
+Bulk loader throughput against moto, optionally with simulated throttling
+
+Throttling is simulated by wrapping the client: a share of batch_write_item
+calls fail with ProvisionedThroughputExceededException and another share
+only process half their requests, returning the rest as UnprocessedItems.
+"""
+import argparse
+import random
+from typing import Any, Dict, List
+
+from .common import load_sample_items, mock_questions_table
+
+
+class ThrottlingClient:
+    """DynamoDB client wrapper that injects throttling and partial batches"""
+
+    def __init__(self, client: Any, throttle_rate: float, partial_rate: float, seed: int = 0):
+        self.client = client
+        self.throttle_rate = throttle_rate
+        self.partial_rate = partial_rate
+        self._random = random.Random(seed)
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        from botocore.exceptions import ClientError
+
+        roll = self._random.random()
+        if roll < self.throttle_rate:
+            raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'BatchWriteItem')
+
+        if roll < self.throttle_rate + self.partial_rate:
+            (table_name, requests), = RequestItems.items()
+            half = len(requests) // 2
+            self.client.batch_write_item(RequestItems={table_name: requests[:half]})
+            return {'UnprocessedItems': {table_name: requests[half:]}}
+
+        return self.client.batch_write_item(RequestItems=RequestItems)
+
+
+def synthetic_items(count: int) -> List[Dict[str, Any]]:
+    """Clone the sample questions into count distinct items"""
+    samples = load_sample_items()
+    items = []
+    for i in range(count):
+        item = dict(samples[i % len(samples)])
+        item['PK'] = {'S': f'QUESTION#bench-{i}'}
+        item['GSI1SK'] = {'S': f'Q#{i:07d}'}
+        items.append(item)
+    return items
+
+
+def run(count: int, workers: int, throttle_rate: float, partial_rate: float) -> None:
+    """Load count synthetic items and print the loader's final statistics"""
+    from src.utils.bulk_loader import BulkLoader
+
+    items = synthetic_items(count)
+    with mock_questions_table() as client:
+        if throttle_rate or partial_rate:
+            client = ThrottlingClient(client, throttle_rate, partial_rate)
+
+        print(f"⏱️  Bulk load of {count} items (max {workers} workers, "
+              f"throttle={throttle_rate:.0%}, partial={partial_rate:.0%})")
+        stats = BulkLoader(dynamodb=client, max_workers=workers, base_delay=0.01).put_items(items)
+
+    print(f"   {stats.written} items in {stats.elapsed:.2f}s ({stats.items_per_second:,.0f} items/s), "
+          f"{stats.batches} batches, {stats.retried_items} retried, {stats.throttle_events} throttle events")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--partial-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    run(args.items, args.workers, args.throttle_rate, args.partial_rate)
@@ -0,0 +1,63 @@
+"""
+Per-item decode+encode cost of the question codec vs the old handler code
+
+Compares the hand-unpacking + json.dumps the handlers used to do with the
+shared codec on the stdlib backend and, when installed, on orjson.
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from .common import load_sample_items
+
+
+def legacy_encode(item: Dict[str, Any]) -> str:
+    """The handlers' original per-item formatting"""
+    question = {
+        'id': item['id']['S'],
+        'question_number': item['question_number']['S'],
+        'question_text': item['question_text']['S'],
+        'correct_count': int(item['correct_count']['N']),
+        'source_page': int(item['source_page']['N']),
+        'exam_type': item['exam_type']['S']
+    }
+    if 'options' in item:
+        question['options'] = [
+            {
+                'letter': opt['M']['letter']['S'],
+                'text': opt['M']['text']['S']
+            }
+            for opt in item['options']['L']
+        ]
+    return json.dumps(question)
+
+
+def run(count: int) -> None:
+    """Encode count items with each implementation and print the per-item cost"""
+    from src.models import question_codec
+
+    samples = load_sample_items()
+    items = [samples[i % len(samples)] for i in range(count)]
+
+    def stdlib_encode(item: Dict[str, Any]) -> str:
+        return question_codec._JSON_ENCODER.encode(question_codec.decode_question_item(item))
+
+    implementations = [("handler hand-unpacking", legacy_encode),
+                       ("codec (stdlib json)", stdlib_encode)]
+    if question_codec.orjson is not None:
+        implementations.append(("codec (orjson)", question_codec.encode_question_item))
+
+    print(f"⏱️  Question decode+encode ({count} items)")
+    for label, encode in implementations:
+        start = time.perf_counter()
+        for item in items:
+            encode(item)
+        per_item_us = (time.perf_counter() - start) / count * 1_000_000
+        print(f"   {label:<24} {per_item_us:8.2f}µs per item")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    run(parser.parse_args().items)
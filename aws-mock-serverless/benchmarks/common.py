@@ -0,0 +1,84 @@
+"""
+Shared helpers for the offline benchmarks
+
+Benchmarks run against moto's in-memory DynamoDB so they need no AWS account.
+Run them from the aws-mock-serverless directory, e.g.
+`uv run python -m benchmarks.handler_latency`.
+"""
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_PDF = PROJECT_ROOT / "resources" / "aws-saa-sample-questions.pdf"
+SAMPLE_DYNAMODB_ITEMS = PROJECT_ROOT / "questions_dynamodb_format.json"
+
+# Paginated handler cases issue page tokens, which need a signing key; set before src is imported
+os.environ.setdefault("PAGINATION_ALLOW_DEV_SECRET", "1")
+
+
+def load_sample_items() -> List[Dict[str, Any]]:
+    """Load the checked-in DynamoDB-format sample questions"""
+    with open(SAMPLE_DYNAMODB_ITEMS, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextmanager
+def mock_questions_table(items: List[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Create a moto-backed questions table, optionally pre-loaded with items"""
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_aws():
+        from src.utils import aws_clients
+        from src.utils.db_utils import questions_table_schema
+
+        aws_clients.reset_clients()
+        client = aws_clients.get_dynamodb_client()
+        client.create_table(**questions_table_schema(aws_clients.TABLE_NAME))
+        for item in items or []:
+            client.put_item(TableName=aws_clients.TABLE_NAME, Item=item)
+
+        try:
+            yield client
+        finally:
+            aws_clients.reset_clients()
+
+
+def time_call(func: Callable[[], Any]) -> float:
+    """Run func once and return the elapsed wall time in milliseconds"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize millisecond samples into count/min/p50/p90/p99/max"""
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "p50": statistics.median(ordered),
+        "p90": pct(90),
+        "p99": pct(99),
+        "max": ordered[-1]
+    }
+
+
+def format_summary(label: str, summary: Dict[str, float]) -> str:
+    """Render a summary as a single aligned report line"""
+    return (f"   {label:<28} n={summary['count']:<5} "
+            f"p50={summary['p50']:8.3f}ms  p90={summary['p90']:8.3f}ms  "
+            f"p99={summary['p99']:8.3f}ms  max={summary['max']:8.3f}ms")
@@ -0,0 +1,49 @@
+"""
+Cold vs warm latency report for the Lambda handlers
+
+A "cold" sample drops the cached DynamoDB client and the read cache before
+invoking the handler, so it pays client creation and the DynamoDB read like a
+fresh container does; a "warm" sample reuses both from the previous invocation.
+"""
+import argparse
+
+from .common import (format_summary, load_sample_items, mock_questions_table,
+                     summarize, time_call)
+
+
+def run(iterations: int) -> None:
+    """Invoke both handlers cold and warm and print latency percentiles"""
+    from src.handlers import get_question, get_questions
+    from src.utils import aws_clients
+    from src.utils.read_cache import question_cache
+
+    items = load_sample_items()
+
+    with mock_questions_table(items):
+        question_event = {'pathParameters': {'id': items[0]['id']['S']}}
+        questions_event = {'queryStringParameters': {'exam_type': 'AWS-SAA-C03'}}
+
+        handlers = [
+            ("get_question", lambda: get_question.lambda_handler(question_event, None)),
+            ("get_questions", lambda: get_questions.lambda_handler(questions_event, None))
+        ]
+
+        print(f"⏱️  Handler latency ({iterations} iterations, moto DynamoDB)")
+        for name, invoke in handlers:
+            cold, warm = [], []
+            for _ in range(iterations):
+                aws_clients.reset_clients()
+                question_cache.clear()
+                cold.append(time_call(invoke))
+                warm.append(time_call(invoke))
+
+            print(format_summary(f"{name} cold", summarize(cold)))
+            print(format_summary(f"{name} warm", summarize(warm)))
+
+        print(f"   read cache: {question_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,103 @@
+"""
+Percentile report over the EMF metric lines written with METRICS_ENABLED=1
+
+Reads log files (or stdin) from local runs, `sam local`, or a CloudWatch Logs
+export, picks out the Embedded Metric Format lines and summarizes each metric
+per dimension set, e.g. per handler. Timings are split into cold and warm
+starts for handlers.
+
+    METRICS_ENABLED=1 uv run python main.py --sync > run.log
+    uv run python -m benchmarks.metrics_report run.log
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from .common import format_summary, summarize
+
+
+def parse_emf_lines(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """EMF documents found in log lines; prefixes such as timestamps and request IDs are skipped"""
+    for line in lines:
+        start = line.find('{')
+        if start < 0 or '"_aws"' not in line:
+            continue
+        try:
+            document = json.loads(line[start:])
+        except ValueError:
+            continue
+        if isinstance(document, dict) and '_aws' in document:
+            yield document
+
+
+def group_documents(documents: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Documents by their dimension values, e.g. "Handler=get_question" """
+    groups = defaultdict(list)
+    for document in documents:
+        directive = document['_aws']['CloudWatchMetrics'][0]
+        dimensions = [name for dimension_set in directive['Dimensions'] for name in dimension_set]
+        groups[" ".join(f"{name}={document.get(name)}" for name in dimensions)].append(document)
+    return dict(groups)
+
+
+def metric_samples(documents: List[Dict[str, Any]]) -> Tuple[Dict[str, List[float]], Dict[str, str]]:
+    """Values of every metric across documents, plus cold/warm splits of the timings"""
+    samples = defaultdict(list)
+    units = {}
+    for document in documents:
+        directive = document['_aws']['CloudWatchMetrics'][0]
+        for metric in directive['Metrics']:
+            name = metric['Name']
+            units[name] = metric.get('Unit', 'None')
+            samples[name].append(document[name])
+            if 'cold_start' in document and units[name] == 'Milliseconds':
+                samples[f"{name} ({'cold' if document['cold_start'] else 'warm'})"].append(document[name])
+    return dict(samples), units
+
+
+def report(groups: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Render the percentile report"""
+    lines = []
+    for label, documents in sorted(groups.items()):
+        samples, units = metric_samples(documents)
+        cold = int(sum(samples.get('cold_start', [])))
+        errors = int(sum(samples.get('errors', [])))
+        lines.append(f"📊 {label}: {len(documents)} lines, {cold} cold starts, {errors} errors")
+
+        for name in sorted(samples):
+            base_name = name.split(' ')[0]
+            if base_name in ('cold_start', 'errors'):
+                continue
+            summary = summarize(samples[name])
+            if units.get(base_name) == 'Milliseconds':
+                lines.append(format_summary(name, summary))
+            else:
+                lines.append(f"   {name:<28} n={summary['count']:<5} "
+                             f"p50={summary['p50']:10.1f}  p99={summary['p99']:10.1f}  "
+                             f"total={sum(samples[name]):12.1f} {units.get(base_name, '')}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Percentile report over EMF metric log lines")
+    parser.add_argument("logs", nargs="*", default=["-"], help="Log files to read, - for stdin (default: stdin)")
+    args = parser.parse_args()
+
+    documents = []
+    for path in args.logs:
+        if path == "-":
+            documents.extend(parse_emf_lines(sys.stdin))
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                documents.extend(parse_emf_lines(f))
+
+    if not documents:
+        raise SystemExit("No EMF metric lines found; were the runs made with METRICS_ENABLED=1?")
+    print(report(group_documents(documents)))
+
+
+if __name__ == "__main__":
+    main()
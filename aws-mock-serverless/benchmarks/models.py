@@ -0,0 +1,103 @@
+"""
+Memory and (de)serialization throughput of the slotted Question model
+
+Builds N synthetic questions with the slotted model and with a plain
+@dataclass copy of the previous model, measures their memory with
+tracemalloc (also after every question's DynamoDB keys were read, so any
+per-instance state built on use is counted) and times the bulk to_*/from_*
+helpers.
+"""
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+@dataclass
+class PlainOption:
+    """The previous, dict-backed QuestionOption"""
+    letter: str
+    text: str
+
+
+@dataclass
+class PlainQuestion:
+    """The previous, dict-backed Question"""
+    id: str
+    question_number: str
+    question_text: str
+    options: List[PlainOption]
+    correct_count: int
+    source_page: int
+    correct_answer: Optional[str] = None
+    exam_type: str = "AWS-SAA-C03"
+
+
+def measure_memory(build: Callable[[], list], touch: Optional[Callable[[object], object]] = None) -> float:
+    """Return the MiB still allocated after build() (and touch() on each object), excluding shared string data"""
+    tracemalloc.start()
+    objects = build()
+    if touch is not None:
+        for obj in objects:
+            touch(obj)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / (1024 * 1024)
+
+
+def timed(label: str, count: int, func: Callable[[], object]) -> None:
+    """Run func once and print its per-item cost and throughput"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<34} {elapsed * 1000:9.1f}ms  {count / elapsed:>12,.0f} items/s")
+
+
+def run(count: int) -> None:
+    """Compare model memory and time the bulk conversion helpers"""
+    from src.models import question as model
+
+    # Share the text objects so only per-object overhead is compared
+    texts = [f"Question text {i % 100}" for i in range(100)]
+    option_texts = [f"Option text {i % 100}" for i in range(100)]
+    letters = "ABCD"
+
+    def build(question_cls, option_cls) -> Callable[[], list]:
+        return lambda: [
+            question_cls(
+                id=f"id-{i}",
+                question_number=str(i),
+                question_text=texts[i % 100],
+                options=[option_cls(letter, option_texts[(i + j) % 100]) for j, letter in enumerate(letters)],
+                correct_count=1,
+                source_page=i // 10
+            )
+            for i in range(count)
+        ]
+
+    print(f"🧮 Question model memory ({count:,} questions, 4 options each)")
+    plain_mib = measure_memory(build(PlainQuestion, PlainOption))
+    slotted_mib = measure_memory(build(model.Question, model.QuestionOption))
+    print(f"   {'@dataclass (previous)':<34} {plain_mib:9.1f}MiB")
+    print(f"   {'@dataclass(slots=True)':<34} {slotted_mib:9.1f}MiB  ({1 - slotted_mib / plain_mib:.0%} less)")
+    touched_mib = measure_memory(build(model.Question, model.QuestionOption),
+                                 touch=lambda q: (q.pk, q.sk, q.gsi1pk))
+    print(f"   {'slots, after pk/sk/gsi1pk access':<34} {touched_mib:9.1f}MiB  ({1 - touched_mib / plain_mib:.0%} less)")
+
+    questions = build(model.Question, model.QuestionOption)()
+    dicts = model.questions_to_dicts(questions)
+    items = model.questions_to_dynamodb_items(questions)
+
+    print(f"⏱️  Bulk (de)serialization ({count:,} questions)")
+    timed("questions_to_dicts", count, lambda: model.questions_to_dicts(questions))
+    timed("questions_to_dynamodb_items", count, lambda: model.questions_to_dynamodb_items(questions))
+    timed("questions_from_dicts", count, lambda: model.questions_from_dicts(dicts))
+    timed("questions_from_dynamodb_items", count, lambda: model.questions_from_dynamodb_items(items))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=100_000)
+    run(parser.parse_args().questions)
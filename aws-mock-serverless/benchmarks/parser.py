@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: single-pass question tokenizer vs the original regex parser
+
+Pages are extracted once up front so only parsing is timed. The original
+implementation is kept here as the reference the tokenizer must match.
+"""
+import argparse
+import re
+import time
+from typing import List, Tuple
+
+from .common import SAMPLE_PDF
+
+
+def legacy_parse(text: str) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
+    """Original parse_questions_from_text/_extract_question_and_options logic"""
+    question_pattern = r'Topic\s+\d+Question\s+#(\d+)'
+    options_pattern = r'\n([A-Z])\.\s+'
+    parsed = []
+
+    question_matches = list(re.finditer(question_pattern, text))
+    for i, match in enumerate(question_matches):
+        start_pos = match.end()
+        end_pos = question_matches[i + 1].start() if i + 1 < len(question_matches) else len(text)
+        question_text = text[start_pos:end_pos].strip()
+
+        options_matches = list(re.finditer(options_pattern, question_text))
+        options = []
+        if options_matches:
+            question_content = question_text[:options_matches[0].start()].strip()
+            question_content = re.sub(r'\s+', ' ', question_content)
+            for j, option_match in enumerate(options_matches):
+                option_start = option_match.end()
+                option_end = options_matches[j + 1].start() if j + 1 < len(options_matches) else len(question_text)
+                option_text = re.sub(r'\s+', ' ', question_text[option_start:option_end].strip())
+                options.append((option_match.group(1), option_text))
+        else:
+            question_content = question_text
+
+        parsed.append((match.group(1), question_content, options))
+
+    return parsed
+
+
+def tokenizer_parse(service, text: str) -> List[Tuple[str, str, List[Tuple[str, str]]]]:
+    """Run the PDFService tokenizer and flatten its output for comparison"""
+    return [
+        (number, content, [(opt.letter, opt.text) for opt in options])
+        for number, content, options, _ in service._tokenize(text)
+    ]
+
+
+def run(repeat: int, scale: int) -> None:
+    """Time both parsers over the sample PDF's pages, optionally concatenated"""
+    from src.services.pdf_service import PDFService
+
+    service = PDFService()
+    pages = [text for _, text in service.extract_pages(SAMPLE_PDF)]
+    if scale > 1:
+        # Simulate large question-bank pages by joining sample pages together
+        pages = ["\n".join(pages) * scale]
+
+    for text in pages:
+        if legacy_parse(text) != tokenizer_parse(service, text):
+            raise SystemExit("❌ Tokenizer output differs from the original parser")
+
+    total_chars = sum(len(text) for text in pages)
+    print(f"⏱️  Parser benchmark ({len(pages)} page(s), {total_chars:,} chars, {repeat} repeats)")
+
+    timings = {}
+    for label, parse in [("original regex parser", legacy_parse),
+                         ("single-pass tokenizer", lambda t: tokenizer_parse(service, t))]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in pages:
+                parse(text)
+        timings[label] = (time.perf_counter() - start) / repeat * 1000
+        print(f"   {label:<24} {timings[label]:8.3f}ms per pass")
+
+    speedup = timings["original regex parser"] / timings["single-pass tokenizer"]
+    print(f"   speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Concatenate all pages and repeat them N times into one page")
+    args = parser.parse_args()
+    run(args.repeat, args.scale)
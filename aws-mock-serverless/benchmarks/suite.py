@@ -0,0 +1,218 @@
+"""
+Benchmark suite with saved baselines and a regression gate
+
+Times PDF page extraction, question parsing, model and API serialization and
+handler latency (moto DynamoDB) over synthetic inputs of increasing size. Each
+case is run several times; the fastest run is what baselines are compared on,
+since it is the least disturbed by other load on the machine (as timeit
+recommends), and the median is reported alongside it.
+
+    # record a baseline on this machine
+    uv run python -m benchmarks.suite --save-baseline
+    # after a change: compare, exiting 1 if any case is >20% slower
+    uv run python -m benchmarks.suite --compare --threshold 0.2
+
+Baselines are machine specific; compare only against one recorded on the
+same hardware and Python version.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from .common import PROJECT_ROOT, mock_questions_table, time_call
+from .synthetic import synthetic_page_texts, synthetic_questions, write_synthetic_pdf
+
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baseline.json"
+
+# Sizes per group; --quick keeps only the first two
+SIZES = {
+    "extraction": [10, 50, 200],  # PDF pages
+    "parsing": [100, 1000, 5000],  # pages of text
+    "serialization": [1000, 10000, 100000],  # questions
+    "handlers": [100, 1000],  # questions in the table
+}
+
+# Each case yields (name, items processed per call, callable to time)
+Case = Tuple[str, int, Callable[[], Any]]
+
+
+def extraction_cases(pages: int, workdir: Path) -> Iterator[Case]:
+    from src.services.pdf_service import PDFService
+
+    pdf_path = write_synthetic_pdf(workdir / f"synthetic-{pages}.pdf", pages)
+    service = PDFService()
+    yield f"extract_pages/{pages}p", pages, lambda: list(service.extract_pages(pdf_path))
+    yield f"extract_all_questions/{pages}p", pages, lambda: service.extract_all_questions(pdf_path)
+
+
+def parsing_cases(pages: int, workdir: Path) -> Iterator[Case]:
+    from src.services.pdf_service import PDFService
+
+    texts = synthetic_page_texts(pages)
+    service = PDFService()
+    yield f"parse_pages/{pages}p", pages, lambda: service.parse_pages(texts)
+
+
+def serialization_cases(count: int, workdir: Path) -> Iterator[Case]:
+    from src.models import question as model
+    from src.models.question_codec import encode_question_item
+
+    questions = synthetic_questions(count)
+    items = model.questions_to_dynamodb_items(questions)
+    dicts = model.questions_to_dicts(questions)
+    yield f"to_dynamodb_item/{count}", count, lambda: model.questions_to_dynamodb_items(questions)
+    yield f"from_dynamodb_item/{count}", count, lambda: model.questions_from_dynamodb_items(items)
+    yield f"to_dict/{count}", count, lambda: model.questions_to_dicts(questions)
+    yield f"from_dict/{count}", count, lambda: model.questions_from_dicts(dicts)
+    yield f"encode_question_item/{count}", count, lambda: [encode_question_item(item) for item in items]
+
+
+def handler_cases(count: int, workdir: Path) -> Iterator[Case]:
+    """Handler latency per call; the read cache is cleared so every call reaches DynamoDB"""
+    from src.handlers import get_question, get_questions, get_questions_batch
+    from src.services.question_service import QuestionService
+    from src.utils.read_cache import question_cache
+
+    questions = [q for q in synthetic_questions(count * 3) if q.exam_type == "AWS-SAA-C03"][:count]
+    items = [q.to_dynamodb_item() for q in questions]
+    snapshots = QuestionService().build_exam_snapshots(questions)
+    items += [snapshot.to_dynamodb_item() for snapshot in snapshots.values()]
+
+    with mock_questions_table(items):
+        def uncached(handler, event):
+            def invoke():
+                question_cache.clear()
+                return handler(event, None)
+            return invoke
+
+        ids = [q.id for q in questions[:50]]
+        yield (f"get_question/{count}", 1,
+               uncached(get_question.lambda_handler, {'pathParameters': {'id': ids[0]}}))
+        yield (f"get_question_cached/{count}", 1,
+               lambda: get_question.lambda_handler({'pathParameters': {'id': ids[0]}}, None))
+        yield (f"get_questions_page50/{count}", 1,
+               uncached(get_questions.lambda_handler,
+                        {'queryStringParameters': {'exam_type': 'AWS-SAA-C03', 'limit': '50'}}))
+        yield (f"get_questions_snapshot/{count}", 1,
+               uncached(get_questions.lambda_handler, {'queryStringParameters': {'exam_type': 'AWS-SAA-C03'}}))
+        yield (f"get_questions_batch50/{count}", 1,
+               uncached(get_questions_batch.lambda_handler, {'queryStringParameters': {'ids': ",".join(ids)}}))
+
+
+GROUPS = {
+    "extraction": extraction_cases,
+    "parsing": parsing_cases,
+    "serialization": serialization_cases,
+    "handlers": handler_cases,
+}
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Time one call with the garbage collector paused, as timeit does"""
+    gc.collect()
+    gc.disable()
+    try:
+        return time_call(func)
+    finally:
+        gc.enable()
+
+
+def run_suite(groups: List[str], repeat: int, quick: bool) -> Dict[str, Dict[str, float]]:
+    """Run every case of the selected groups and return timings by case name"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for group in groups:
+            print(f"⏱️  {group}")
+            for size in SIZES[group][:2] if quick else SIZES[group]:
+                for name, items, func in GROUPS[group](size, Path(tmp)):
+                    func()  # warm up imports, caches and connections
+                    samples = [timed(func) for _ in range(repeat)]
+                    best_ms = min(samples)
+                    results[name] = {
+                        "best_ms": best_ms,
+                        "median_ms": statistics.median(samples),
+                        "per_item_us": best_ms * 1000 / items
+                    }
+                    print(f"   {name:<34} best={best_ms:10.3f}ms  median={results[name]['median_ms']:10.3f}ms  "
+                          f"{results[name]['per_item_us']:10.2f}µs/item")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """What the numbers depend on besides the code"""
+    from src.models import question_codec
+    from src.models import exam_snapshot
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "orjson": str(question_codec.orjson is not None),
+        "brotli": str(exam_snapshot.brotli is not None)
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the change per case and return the cases slower than baseline by more than threshold"""
+    if baseline.get("environment") != environment():
+        print(f"⚠️  Baseline was recorded on a different environment: {baseline.get('environment')}")
+
+    regressions = []
+    print(f"\n📈 Against baseline (threshold +{threshold:.0%})")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"   {name:<34} (new case)")
+            continue
+        change = result["best_ms"] / previous["best_ms"] - 1
+        marker = "❌" if change > threshold else "✅"
+        print(f"   {marker} {name:<32} {previous['best_ms']:10.3f}ms -> {result['best_ms']:10.3f}ms  {change:+7.1%}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite with a regression gate")
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"Comma separated groups to run (default: {','.join(GROUPS)})")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case (default: 7)")
+    parser.add_argument("--quick", action="store_true", help="Only the two smallest sizes per group")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH",
+                        help=f"Write results as the baseline (default path: {DEFAULT_BASELINE.name})")
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), metavar="PATH",
+                        help="Compare against a saved baseline and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before a case counts as a regression (default: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+
+    results = run_suite(groups, args.repeat, args.quick)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"\n💾 Saved baseline: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
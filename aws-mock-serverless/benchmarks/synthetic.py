@@ -0,0 +1,107 @@
+"""
+Synthetic question sets, page texts and PDFs of any size for the benchmarks
+
+Everything is generated from a seeded RNG so runs are comparable, and the
+text follows the dump layout PDFService parses ("Topic 1Question #N" headers
+followed by "A. ..." option lines).
+"""
+import random
+import textwrap
+from pathlib import Path
+from typing import List, Tuple
+
+WORDS = (
+    "a company application amazon aurora availability bucket cache cloudfront cost data database "
+    "deploy design dynamodb ec2 ecs encryption glacier global high iam instance lambda latency "
+    "load balancer migrate multiple network on-premises performance region replicas requirements "
+    "resilient s3 scale secure serverless solution storage team traffic users vpc workload"
+).split()
+EXAM_TYPES = ("AWS-SAA-C03", "AWS-DVA-C02", "AWS-SOA-C02")
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(min_words, max_words))).capitalize() + "."
+
+
+def synthetic_questions(count: int, seed: int = 0) -> list:
+    """Build count questions spread over a few exam types"""
+    from src.models.question import Question, QuestionOption
+
+    rng = random.Random(seed)
+    return [
+        Question.create_new(
+            question_number=str(i + 1),
+            question_text=_sentence(rng, 30, 80),
+            options=[QuestionOption(letter=letter, text=_sentence(rng, 5, 25)) for letter in "ABCD"],
+            source_page=i // 2 + 1,
+            exam_type=EXAM_TYPES[i % len(EXAM_TYPES)],
+            topic=str(i % 5 + 1)
+        )
+        for i in range(count)
+    ]
+
+
+def synthetic_page_lines(pages: int, questions_per_page: int = 2, seed: int = 0) -> List[List[str]]:
+    """Text lines of each page in the question dump layout"""
+    rng = random.Random(seed)
+    result = []
+    number = 0
+    for _ in range(pages):
+        lines = []
+        for _ in range(questions_per_page):
+            number += 1
+            lines.append(f"Topic 1Question #{number}")
+            lines.extend(textwrap.wrap(_sentence(rng, 30, 60), 90))
+            for letter in "ABCD":
+                lines.extend(textwrap.wrap(f"{letter}. {_sentence(rng, 5, 15)}", 90))
+        result.append(lines)
+    return result
+
+
+def synthetic_page_texts(pages: int, questions_per_page: int = 2, seed: int = 0) -> List[Tuple[int, str]]:
+    """(page number, text) pairs as PDFService.extract_pages would yield them"""
+    return [(page_num, "\n".join(lines))
+            for page_num, lines in enumerate(synthetic_page_lines(pages, questions_per_page, seed), start=1)]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_synthetic_pdf(path: str | Path, pages: int, questions_per_page: int = 2, seed: int = 0) -> Path:
+    """Write a minimal text-only PDF (Helvetica, one line per text row)"""
+    page_lines = synthetic_page_lines(pages, questions_per_page, seed)
+
+    # 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    for lines in page_lines:
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(f"({_escape(line)}) Tj T*" for line in lines) + " ET"
+        stream_bytes = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream_bytes), stream_bytes))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    path = Path(path)
+    path.write_bytes(bytes(out))
+    return path
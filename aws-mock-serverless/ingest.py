@@ -0,0 +1,70 @@
+"""
+Batch ingest script: extract every PDF in a directory concurrently
+Questions stream through validation into JSON Lines files and/or DynamoDB
+"""
+import argparse
+
+from src.services.ingest_pipeline import BatchIngestPipeline, DynamoDBSink, IngestState, JsonlSink
+from src.utils import metrics
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Ingest a directory of AWS certification PDFs")
+    parser.add_argument("input_dir", help="Directory searched recursively for PDF files")
+    parser.add_argument("--output-dir", default="ingested",
+                        help="Write one <pdf name>.jsonl.gz per PDF here (default: ingested)")
+    parser.add_argument("--no-files", action="store_true",
+                        help="Skip the JSON Lines file sink")
+    parser.add_argument("--sync", action="store_true",
+                        help="Also put questions into the DynamoDB table")
+    parser.add_argument("--search-index", default="search_index.bin",
+                        help="With --sync, rebuild the keyword search index artifact here (default: search_index.bin)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="PDFs extracted concurrently, one process each (default: 4)")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="Question batches buffered between stages before extraction waits (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Questions per batch passed between stages (default: 500)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Drop questions failing batch quality checks (requires the `quality` extra)")
+    parser.add_argument("--state-file", default=".ingest_state.json",
+                        help="Per-file status used to resume interrupted runs (default: .ingest_state.json)")
+    return parser.parse_args()
+
+
+def main():
+    """Run the batch ingest pipeline"""
+    args = parse_args()
+    
+    sinks = []
+    if not args.no_files:
+        sinks.append(JsonlSink(args.output_dir))
+    if args.sync:
+        sinks.append(DynamoDBSink(search_index_path=args.search_index))
+    if not sinks:
+        raise SystemExit("Nothing to write: drop --no-files or add --sync")
+    
+    pipeline = BatchIngestPipeline(
+        sinks,
+        IngestState(args.state_file),
+        workers=args.workers,
+        queue_size=args.queue_size,
+        batch_size=args.batch_size,
+        validate=args.validate
+    )
+    
+    print(f"🔄 Ingesting PDFs from {args.input_dir}...")
+    summary = pipeline.run(args.input_dir)
+    print("\n" + summary.report())
+    metrics.count("questions", summary.questions)
+    metrics.count("input_bytes", summary.input_bytes, "Bytes")
+    metrics.count("duration_ms", summary.elapsed * 1000, "Milliseconds")
+    metrics.emit_process_metrics('ingest', files=summary.files, failed=summary.failed)
+    
+    if summary.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
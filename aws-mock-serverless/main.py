@@ -2,12 +2,68 @@
 Main script for local development and testing
 This script demonstrates the PDF processing pipeline locally
 """
+import argparse
+import json
+
+from src.services.dedupe_service import DuplicateDetector
+from src.services.extraction_cache import ExtractionCache
 from src.services.pdf_service import PDFService
 from src.services.question_service import QuestionService
+from src.utils import metrics
+from src.utils.db_utils import DynamoDBUtils
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Extract questions from AWS certification PDFs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to extract PDF pages (default: 1, serial)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream pages from a memory-mapped file with bounded memory, for very large PDFs")
+    parser.add_argument("--layout", action="store_true",
+                        help="With --stream, extract text in layout mode (visual reading order)")
+    parser.add_argument("--cache-dir",
+                        help="Reuse extracted pages from this directory; only changed pages are re-extracted")
+    parser.add_argument("--cache-max-mb", type=int, default=256,
+                        help="Evict least recently used cache entries beyond this size (default: 256)")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Invalidate every entry in --cache-dir and exit")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Merge near-duplicate questions (same exam type, similar text and options)")
+    parser.add_argument("--dedupe-threshold", type=float, default=0.7,
+                        help="Minimum estimated similarity for --dedupe to merge two questions (default: 0.7)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Run batch quality checks and stop before saving if any question fails "
+                             "(requires the `quality` extra)")
+    parser.add_argument("--quality-report",
+                        help="With --validate, write the per-page quality report to this JSON file")
+    parser.add_argument("--search-index", default="search_index.bin",
+                        help="Where to write the keyword search index artifact (default: search_index.bin)")
+    parser.add_argument("--sync", action="store_true",
+                        help="Sync questions to the DynamoDB table, writing only inserted/changed items "
+                             "and deleting removed ones")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="With --sync, report the diff without writing")
+    return parser.parse_args()
 
 
 def main():
     """Main function for local PDF processing and testing"""
+    args = parse_args()
+    
+    cache = None
+    if args.cache_dir:
+        cache = ExtractionCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+        if args.clear_cache:
+            cache.clear()
+            print(f"🗑️  Cleared extraction cache: {args.cache_dir}")
+            return
+    elif args.clear_cache:
+        raise SystemExit("--clear-cache requires --cache-dir")
+    if args.stream and (cache is not None or args.workers > 1):
+        raise SystemExit("--stream reads pages one at a time and cannot be combined with --cache-dir or --workers")
+    if args.layout and not args.stream:
+        raise SystemExit("--layout requires --stream")
     
     # Initialize services
     pdf_service = PDFService()
@@ -15,9 +71,39 @@ def main():
     
     # Extract questions from PDF
     print("🔄 Processing PDF...")
-    questions = pdf_service.extract_all_questions("./resources/aws-saa-sample-questions.pdf")
+    pdf_path = "./resources/aws-saa-sample-questions.pdf"
+    if args.stream:
+        questions = list(pdf_service.iter_questions_streaming(pdf_path, layout=args.layout))
+    else:
+        questions = pdf_service.extract_all_questions(pdf_path, workers=args.workers, cache=cache)
     
     print(f"✅ Extracted {len(questions)} questions from PDF")
+    if cache is not None:
+        print(f"   Cache: {cache.hits} pages reused, {cache.misses} pages extracted")
+    
+    if args.dedupe:
+        questions, clusters = DuplicateDetector(threshold=args.dedupe_threshold).dedupe(questions)
+        merged = sum(len(cluster.duplicates) for cluster in clusters)
+        print(f"🧹 Merged {merged} near-duplicates into {len(clusters)} questions, {len(questions)} remain")
+        for cluster in clusters[:5]:
+            kept = cluster.representative
+            print(f"   Q{kept.question_number} (page {kept.source_page}) <- " + ", ".join(
+                f"Q{dup.question_number} p{dup.source_page} ({score:.0%})"
+                for dup, score in zip(cluster.duplicates, cluster.similarities)))
+    if args.validate:
+        report = question_service.validate_questions(questions)
+        if args.quality_report:
+            with open(args.quality_report, "w", encoding="utf-8") as f:
+                json.dump(report.to_dict(), f, indent=2)
+            print(f"📝 Saved quality report: {args.quality_report}")
+        for check, question_ids in report.failures.items():
+            print(f"   {check}: {len(question_ids)}")
+        for page, quality in sorted(report.pages.items()):
+            if quality.errors or quality.warnings:
+                print(f"   Page {page}: {quality.errors} errors, {quality.warnings} warnings {quality.checks}")
+        if not report.is_valid:
+            raise SystemExit(f"❌ {len(report.invalid_ids)} of {report.total} questions failed validation")
+        print(f"✅ All {report.total} questions passed validation")
     print("\n" + "="*80 + "\n")
     
     # Display first question as example
@@ -43,11 +129,34 @@ def main():
     print(f"💾 Saved questions in regular format: extracted_questions.json")
     print(f"💾 Saved questions in DynamoDB format: questions_dynamodb_format.json")
     
+    index_bytes = question_service.save_search_index(questions, args.search_index)
+    print(f"🔎 Built search index: {args.search_index} ({index_bytes} bytes)")
+    
+    if args.sync:
+        db_utils = DynamoDBUtils()
+        try:
+            # Caches are invalidated once, after the snapshots and indexes below
+            stats = db_utils.sync_items([q.to_dynamodb_item() for q in questions], dry_run=args.dry_run,
+                                        bump_version=False)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}; fix the source PDF or merge them with --dedupe")
+        label = "Diff against" if args.dry_run else "Synced to"
+        print(f"🔁 {label} {db_utils.table_name}: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged")
+        
+        if not args.dry_run:
+            # The search index was written above, whether or not the table is synced
+            question_service.publish_exam_artifacts(db_utils, questions)
+    
     print(f"\n📊 Summary:")
     print(f"   - Total Questions: {len(questions)}")
     print(f"   - With Options: {sum(1 for q in questions if len(q.options) > 0)}")
     print(f"   - Pages Processed: {len(set(q.source_page for q in questions))}")
     print(f"   - Exam Type: {questions[0].exam_type if questions else 'N/A'}")
+    
+    # One EMF line with the run's stage timings and DynamoDB usage when METRICS_ENABLED is set
+    metrics.count("questions", len(questions))
+    metrics.emit_process_metrics('main', pdf=pdf_path)
 
 
 if __name__ == "__main__":
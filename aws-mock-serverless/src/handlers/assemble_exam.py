@@ -0,0 +1,158 @@
+"""
+Lambda handler for drawing a random mock exam from the packed exam ID index
+"""
+import json
+import os
+import secrets
+from typing import Dict, Any, List, Optional
+
+from ..models.exam_index import ExamIndex
+from ..models.question_codec import encode_questions_body
+from ..utils.aws_clients import TABLE_NAME, get_dynamodb_client
+from ..utils.db_utils import batch_get_items, get_data_version
+from ..utils.metrics import instrument_handler, stage
+from ..utils.read_cache import MISS, question_cache
+from .get_questions_batch import fetch_question_bodies
+
+DEFAULT_EXAM_QUESTIONS = int(os.environ.get('DEFAULT_EXAM_QUESTIONS', 65))
+MAX_EXAM_QUESTIONS = int(os.environ.get('MAX_EXAM_QUESTIONS', 200))
+
+
+def _load_index(dynamodb: Any, exam_type: str, refresh: bool = False) -> Optional[ExamIndex]:
+    """Index metadata for an exam type, cached for the container unless refresh is set"""
+    cache_key = ('exam_index', exam_type)
+    index = MISS if refresh else question_cache.get(cache_key)
+    if index is MISS:
+        response = dynamodb.get_item(
+            TableName=TABLE_NAME,
+            Key={'PK': {'S': ExamIndex.partition_key(exam_type)}}
+        )
+        index = ExamIndex.from_dynamodb_item(response['Item']) if 'Item' in response else None
+        question_cache.put(cache_key, index)
+    return index
+
+
+def _load_shards(dynamodb: Any, index: ExamIndex, shard_numbers: List[int]) -> Optional[Dict[int, bytes]]:
+    """
+    Packed ID shards of this index version by number, reading only the ones not cached yet
+
+    None when some are gone, which happens when the index was replaced after
+    its metadata was cached.
+    """
+    cache_keys = {number: ('exam_index_shard', index.exam_type, index.version, number) for number in shard_numbers}
+    shards = {number: question_cache.get(cache_key) for number, cache_key in cache_keys.items()}
+    uncached = {index.shard_key(number): number for number, ids in shards.items() if ids is MISS}
+    if uncached:
+        items = batch_get_items(dynamodb, TABLE_NAME, [{'PK': {'S': key}} for key in uncached])
+        for item in items:
+            number = uncached[item['PK']['S']]
+            shards[number] = item['ids']['B']
+            question_cache.put(cache_keys[number], shards[number])
+
+    if any(ids is MISS for ids in shards.values()):
+        return None
+    return shards
+
+
+def _draw_ids(dynamodb: Any, index: ExamIndex, count: int, seed: str, stratify: bool) -> Optional[List[str]]:
+    """Question IDs of a draw in O(count), or None if the index's shards were replaced"""
+    with stage('sample'):
+        positions = index.sample_positions(count, seed=seed, stratify=stratify)
+    with stage('load_shards'):
+        shards = _load_shards(dynamodb, index, sorted({ExamIndex.shard_of(p) for p in positions}))
+    if shards is None:
+        return None
+    return [ExamIndex.id_at(shards[ExamIndex.shard_of(p)], p) for p in positions]
+
+
+@instrument_handler('assemble_exam')
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for GET /exams/random endpoint
+
+    Query parameters: exam_type (required), count (default 65), seed to
+    reproduce a draw and stratify=topic to mirror the bank's topic mix. The
+    seed used is echoed back, so any draw can be replayed.
+    """
+
+    try:
+        query_params = event.get('queryStringParameters') or {}
+        exam_type = query_params.get('exam_type')
+
+        try:
+            if not exam_type:
+                raise ValueError("Query parameter 'exam_type' is required")
+            count = int(query_params.get('count', DEFAULT_EXAM_QUESTIONS))
+            if not 1 <= count <= MAX_EXAM_QUESTIONS:
+                raise ValueError(f"'count' must be between 1 and {MAX_EXAM_QUESTIONS}")
+            stratify = query_params.get('stratify')
+            if stratify not in (None, 'topic'):
+                raise ValueError("'stratify' only supports 'topic'")
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': 'Invalid request',
+                    'message': str(e)
+                })
+            }
+
+        seed = query_params.get('seed') or secrets.token_hex(8)
+
+        # Reuse the container-wide DynamoDB client
+        dynamodb = get_dynamodb_client()
+        question_cache.sync_version(lambda: get_data_version(dynamodb, TABLE_NAME))
+
+        index = _load_index(dynamodb, exam_type)
+        if index is None:
+            return {
+                'statusCode': 404,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': 'Exam type not found'
+                })
+            }
+
+        # O(count) work from here on: pick positions, read the shards they fall in, fetch the questions
+        question_ids = _draw_ids(dynamodb, index, count, seed, stratify == 'topic')
+        if question_ids is None:
+            # A re-ingest replaced the cached index version; draw again from the current one
+            index = _load_index(dynamodb, exam_type, refresh=True)
+            question_ids = _draw_ids(dynamodb, index, count, seed, stratify == 'topic') if index else None
+            if question_ids is None:
+                raise RuntimeError(f"Exam index shards of {exam_type} are missing")
+
+        with stage('fetch_questions'):
+            bodies = fetch_question_bodies(dynamodb, question_ids)
+        questions = [bodies[question_id] for question_id in question_ids if bodies[question_id] is not None]
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': encode_questions_body(questions, count=len(questions), exam_type=exam_type, seed=seed)
+        }
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'error': 'Internal server error',
+                'message': str(e)
+            })
+        }
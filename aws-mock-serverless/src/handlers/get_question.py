@@ -2,10 +2,17 @@
 Lambda handler for getting a single question by ID
 """
 import json
-import boto3
 from typing import Dict, Any
 
+from ..models.question import Question
+from ..models.question_codec import encode_question_item
+from ..utils.aws_clients import TABLE_NAME, get_dynamodb_client
+from ..utils.db_utils import get_data_version
+from ..utils.metrics import instrument_handler
+from ..utils.read_cache import MISS, question_cache
 
+
+@instrument_handler('get_question')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for GET /questions/{id} endpoint
@@ -27,60 +34,51 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        # Initialize DynamoDB client
-        dynamodb = boto3.client('dynamodb')
-        table_name = 'aws-mock-questions'  # This would come from environment variable
+        # Reuse the container-wide DynamoDB client
+        dynamodb = get_dynamodb_client()
         
-        # Get question from DynamoDB
-        response = dynamodb.get_item(
-            TableName=table_name,
-            Key={
-                'PK': {'S': f'QUESTION#{question_id}'}
-            }
-        )
+        # Serve from the warm-container cache unless the ingest published new data
+        question_cache.sync_version(lambda: get_data_version(dynamodb, TABLE_NAME))
+        cache_key = ('question', question_id)
+        body = question_cache.get(cache_key)
+        cache_status = 'HIT' if body is not MISS else 'MISS'
         
-        if 'Item' not in response:
+        if body is MISS:
+            # Get question from DynamoDB
+            response = dynamodb.get_item(
+                TableName=TABLE_NAME,
+                Key={
+                    'PK': {'S': Question.partition_key(question_id)}
+                }
+            )
+            
+            # Missing questions are cached too (negative caching)
+            body = encode_question_item(response['Item']) if 'Item' in response else None
+            question_cache.put(cache_key, body)
+        
+        if body is None:
             return {
                 'statusCode': 404,
                 'headers': {
                     'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
+                    'Access-Control-Allow-Origin': '*',
+                    'X-Cache': cache_status
                 },
                 'body': json.dumps({
                     'error': 'Question not found'
                 })
             }
         
-        # Format response
-        item = response['Item']
-        question = {
-            'id': item['id']['S'],
-            'question_number': item['question_number']['S'],
-            'question_text': item['question_text']['S'],
-            'correct_count': int(item['correct_count']['N']),
-            'source_page': int(item['source_page']['N']),
-            'exam_type': item['exam_type']['S']
-        }
-        
-        # Add options if present
-        if 'options' in item:
-            question['options'] = [
-                {
-                    'letter': opt['M']['letter']['S'],
-                    'text': opt['M']['text']['S']
-                }
-                for opt in item['options']['L']
-            ]
-        
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': 'Content-Type'
+                'Access-Control-Allow-Headers': 'Content-Type',
+                'X-Cache': cache_status
             },
-            'body': json.dumps(question)
+            'body': body
         }
         
     except Exception as e:
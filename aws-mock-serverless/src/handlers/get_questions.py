@@ -1,83 +1,172 @@
 """
 Lambda handler for getting all questions
 """
+import base64
 import json
-import boto3
 from typing import Dict, Any
 
+from ..models.exam_snapshot import ExamSnapshot
+from ..models.question_codec import encode_question_item, encode_questions_body
+from ..utils.aws_clients import TABLE_NAME, get_dynamodb_client
+from ..utils.db_utils import get_data_version
+from ..utils.metrics import instrument_handler
+from ..utils.pagination import (MAX_RESPONSE_BYTES, clamp_page_size,
+                                decode_page_token, encode_page_token)
+from ..utils.read_cache import MISS, question_cache
+
 # This would be imported in actual Lambda environment
 # from ..services.question_service import QuestionService
 
+PAGING_PARAMETERS = ('limit', 'next_token', 'max_bytes')
+
+
+def _snapshot_response(snapshot: ExamSnapshot, request_headers: Dict[str, str]) -> Dict[str, Any]:
+    """Serve a precomputed exam snapshot, honouring If-None-Match and Accept-Encoding"""
+    request_headers = {name.lower(): value for name, value in request_headers.items()}
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET',
+        'Access-Control-Allow-Headers': 'Content-Type, If-None-Match',
+        'Access-Control-Expose-Headers': 'ETag',
+        'ETag': snapshot.etag,
+        'Vary': 'Accept-Encoding'
+    }
+
+    if_none_match = [tag.strip() for tag in request_headers.get('if-none-match', '').split(',')]
+    if snapshot.etag in if_none_match or '*' in if_none_match:
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+
+    accepted = {token.split(';')[0].strip() for token in request_headers.get('accept-encoding', '').split(',')}
+    if snapshot.body_br and 'br' in accepted:
+        headers['Content-Encoding'] = 'br'
+        body = snapshot.body_br
+    elif 'gzip' in accepted:
+        headers['Content-Encoding'] = 'gzip'
+        body = snapshot.body_gzip
+    else:
+        return {'statusCode': 200, 'headers': headers, 'body': snapshot.body().decode('utf-8')}
+
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': base64.b64encode(body).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
 
+@instrument_handler('get_questions')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for GET /questions endpoint
-    
+
+    Requests without paging parameters get the whole exam set from the
+    precomputed snapshot (ETag / If-None-Match aware) when one was published.
+
     Query Parameters:
     - exam_type: Filter by exam type (optional)
-    - limit: Number of questions to return (optional)
+    - limit: Page size, clamped to 1..100 (optional)
+    - next_token: Continuation token from a previous response (optional)
+    - max_bytes: Keep reading pages until roughly this many response bytes
+      have been collected, capped server-side (optional)
     """
-    
+
     try:
         # Extract query parameters
         query_params = event.get('queryStringParameters') or {}
         exam_type = query_params.get('exam_type', 'AWS-SAA-C03')
-        limit = int(query_params.get('limit', 50))
-        
-        # Initialize DynamoDB client
-        dynamodb = boto3.client('dynamodb')
-        table_name = 'aws-mock-questions'  # This would come from environment variable
-        
-        # Query DynamoDB
-        response = dynamodb.query(
-            TableName=table_name,
-            IndexName='GSI1',  # Global Secondary Index for exam type
-            KeyConditionExpression='GSI1PK = :exam_type',
-            ExpressionAttributeValues={
-                ':exam_type': {'S': f'EXAM#{exam_type}'}
-            },
-            Limit=limit
-        )
-        
-        # Format response
-        questions = []
-        for item in response['Items']:
-            question = {
-                'id': item['id']['S'],
-                'question_number': item['question_number']['S'],
-                'question_text': item['question_text']['S'],
-                'correct_count': int(item['correct_count']['N']),
-                'source_page': int(item['source_page']['N']),
-                'exam_type': item['exam_type']['S']
+
+        try:
+            limit = clamp_page_size(query_params.get('limit'))
+            byte_budget = min(int(query_params.get('max_bytes', 0)), MAX_RESPONSE_BYTES)
+            start_key = (decode_page_token(query_params['next_token'], exam_type)
+                         if query_params.get('next_token') else None)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                })
+            }
+
+        # Reuse the container-wide DynamoDB client
+        dynamodb = get_dynamodb_client()
+
+        # Serve from the warm-container cache unless the ingest published new data
+        question_cache.sync_version(lambda: get_data_version(dynamodb, TABLE_NAME))
+
+        if not any(query_params.get(name) for name in PAGING_PARAMETERS):
+            snapshot = question_cache.get(('snapshot', exam_type))
+            if snapshot is MISS:
+                response = dynamodb.get_item(
+                    TableName=TABLE_NAME,
+                    Key={'PK': {'S': ExamSnapshot.partition_key(exam_type)}}
+                )
+                snapshot = ExamSnapshot.from_dynamodb_item(response['Item']) if 'Item' in response else None
+                question_cache.put(('snapshot', exam_type), snapshot)
+
+            if snapshot is not None:
+                return _snapshot_response(snapshot, event.get('headers') or {})
+
+        cache_key = ('questions', exam_type, limit, byte_budget, query_params.get('next_token'))
+        body = question_cache.get(cache_key)
+        cache_status = 'HIT' if body is not MISS else 'MISS'
+
+        if body is MISS:
+            query_kwargs = {
+                'TableName': TABLE_NAME,
+                'IndexName': 'GSI1',  # Global Secondary Index for exam type
+                'KeyConditionExpression': 'GSI1PK = :exam_type',
+                'ExpressionAttributeValues': {
+                    ':exam_type': {'S': f'EXAM#{exam_type}'}
+                },
+                'Limit': limit
             }
-            
-            # Add options if present
-            if 'options' in item:
-                question['options'] = [
-                    {
-                        'letter': opt['M']['letter']['S'],
-                        'text': opt['M']['text']['S']
-                    }
-                    for opt in item['options']['L']
-                ]
-            
-            questions.append(question)
-        
+
+            # Read one page, or several pages when the caller set a byte budget
+            questions = []
+            collected_bytes = 0
+            while True:
+                if start_key:
+                    query_kwargs['ExclusiveStartKey'] = start_key
+
+                response = dynamodb.query(**query_kwargs)
+
+                # Encode each question once; the body is spliced from the encoded strings
+                for item in response['Items']:
+                    encoded = encode_question_item(item)
+                    questions.append(encoded)
+                    collected_bytes += len(encoded)
+
+                start_key = response.get('LastEvaluatedKey')
+                if not start_key or collected_bytes >= byte_budget:
+                    break
+
+            body = encode_questions_body(
+                questions,
+                count=len(questions),
+                exam_type=exam_type,
+                next_token=encode_page_token(start_key, exam_type)
+            )
+            question_cache.put(cache_key, body)
+
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*',  # Configure properly for production
                 'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': 'Content-Type'
+                'Access-Control-Allow-Headers': 'Content-Type',
+                'X-Cache': cache_status
             },
-            'body': json.dumps({
-                'questions': questions,
-                'count': len(questions),
-                'exam_type': exam_type
-            })
+            'body': body
         }
-        
+
     except Exception as e:
         return {
             'statusCode': 500,
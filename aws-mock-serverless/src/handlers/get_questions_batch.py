@@ -0,0 +1,120 @@
+"""
+Lambda handler for getting several questions by ID in one request
+"""
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+from ..models.question import Question
+from ..models.question_codec import encode_question_item, encode_questions_body
+from ..utils.aws_clients import TABLE_NAME, get_dynamodb_client
+from ..utils.db_utils import batch_get_items, get_data_version
+from ..utils.metrics import instrument_handler
+from ..utils.read_cache import MISS, question_cache
+
+MAX_BATCH_GET_IDS = int(os.environ.get('MAX_BATCH_GET_IDS', 200))
+
+
+def _requested_ids(event: Dict[str, Any]) -> List[str]:
+    """Read IDs from a JSON body {"ids": [...]} or an ?ids=a,b,c query parameter"""
+    if event.get('body'):
+        payload = json.loads(event['body'])
+        ids = payload.get('ids') if isinstance(payload, dict) else None
+        if not isinstance(ids, list):
+            raise ValueError("'ids' must be a list")
+    else:
+        query_params = event.get('queryStringParameters') or {}
+        ids = (query_params.get('ids') or '').split(',')
+
+    # Keep the caller's order, dropping blanks and repeats
+    return list(dict.fromkeys(str(question_id).strip() for question_id in ids if str(question_id).strip()))
+
+
+def fetch_question_bodies(dynamodb: Any, question_ids: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Encoded question bodies by ID (None for missing questions)
+
+    Answers what it can from the warm-container cache shared with get_question
+    and reads the rest with BatchGetItem. Call question_cache.sync_version first.
+    """
+    bodies = {question_id: question_cache.get(('question', question_id)) for question_id in question_ids}
+
+    uncached = [question_id for question_id, body in bodies.items() if body is MISS]
+    if uncached:
+        items = batch_get_items(
+            dynamodb,
+            TABLE_NAME,
+            [{'PK': {'S': Question.partition_key(question_id)}} for question_id in uncached]
+        )
+        for item in items:
+            bodies[item['id']['S']] = encode_question_item(item)
+
+        for question_id in uncached:
+            if bodies[question_id] is MISS:
+                bodies[question_id] = None
+            question_cache.put(('question', question_id), bodies[question_id])
+
+    return bodies
+
+
+@instrument_handler('get_questions_batch')
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for GET|POST /questions/batch endpoint
+
+    Accepts up to MAX_BATCH_GET_IDS question IDs and returns the found questions
+    in the caller's order, plus the IDs that do not exist.
+    """
+
+    try:
+        try:
+            question_ids = _requested_ids(event)
+            if not question_ids:
+                raise ValueError("At least one question ID is required")
+            if len(question_ids) > MAX_BATCH_GET_IDS:
+                raise ValueError(f"At most {MAX_BATCH_GET_IDS} question IDs can be requested at once")
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': 'Invalid request',
+                    'message': str(e)
+                })
+            }
+
+        # Reuse the container-wide DynamoDB client
+        dynamodb = get_dynamodb_client()
+
+        question_cache.sync_version(lambda: get_data_version(dynamodb, TABLE_NAME))
+        bodies = fetch_question_bodies(dynamodb, question_ids)
+
+        questions = [bodies[question_id] for question_id in question_ids if bodies[question_id] is not None]
+        missing = [question_id for question_id in question_ids if bodies[question_id] is None]
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, POST',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': encode_questions_body(questions, count=len(questions), missing=missing)
+        }
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'error': 'Internal server error',
+                'message': str(e)
+            })
+        }
@@ -0,0 +1,104 @@
+"""
+Lambda handler for keyword search over the prebuilt question search index
+"""
+import json
+import os
+from typing import Dict, Any, Optional
+
+from ..models.question_codec import encode_json
+from ..services.search_index import SearchIndex
+from ..utils.metrics import instrument_handler, stage
+
+SEARCH_INDEX_PATH = os.environ.get('SEARCH_INDEX_PATH', 'search_index.bin')
+MAX_SEARCH_RESULTS = int(os.environ.get('MAX_SEARCH_RESULTS', 50))
+
+# Loaded on the first request and kept for the lifetime of the container
+_search_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Memory-map the search index once per container"""
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex.load(SEARCH_INDEX_PATH)
+    return _search_index
+
+
+@instrument_handler('search_questions')
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Lambda handler for GET /questions/search endpoint
+
+    Query parameters: q (required), exam_type, limit and prefix=true to treat
+    the last term as a prefix. Terms ending in '*' are always prefix matches.
+    Returns ranked question IDs; fetch full questions with /questions/batch.
+    """
+
+    try:
+        query_params = event.get('queryStringParameters') or {}
+        query = (query_params.get('q') or '').strip()
+
+        try:
+            if not query:
+                raise ValueError("Query parameter 'q' is required")
+            limit = int(query_params.get('limit', 10))
+            if not 1 <= limit <= MAX_SEARCH_RESULTS:
+                raise ValueError(f"'limit' must be between 1 and {MAX_SEARCH_RESULTS}")
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({
+                    'error': 'Invalid request',
+                    'message': str(e)
+                })
+            }
+
+        with stage('load_index'):
+            search_index = get_search_index()
+        with stage('search'):
+            hits = search_index.search(
+                query,
+                limit=limit,
+                exam_type=query_params.get('exam_type'),
+                prefix=query_params.get('prefix', '').lower() == 'true'
+            )
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': encode_json({
+                'query': query,
+                'results': [
+                    {
+                        'id': hit.question_id,
+                        'question_number': hit.question_number,
+                        'exam_type': hit.exam_type,
+                        'score': hit.score
+                    }
+                    for hit in hits
+                ],
+                'count': len(hits)
+            })
+        }
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'error': 'Internal server error',
+                'message': str(e)
+            })
+        }
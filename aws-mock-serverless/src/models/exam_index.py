@@ -0,0 +1,139 @@
+"""
+Packed per-exam question ID index used to draw random exams
+"""
+from dataclasses import dataclass
+import hashlib
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+
+from .question import Question
+
+
+# 16-byte UUIDs; 20k IDs per shard keeps each item well under DynamoDB's 400KB limit
+ID_BYTES = 16
+IDS_PER_SHARD = 20000
+
+
+@dataclass
+class ExamIndex:
+    """
+    Question IDs of one exam type packed into fixed-width binary shards
+
+    IDs are grouped by topic, so each topic is a contiguous position range and
+    the i-th ID is bytes [16*i, 16*i+16) across the concatenated shards. The
+    metadata item (count, topics, shard count) is enough to pick positions;
+    only shards holding picked positions have to be read.
+
+    Shard keys carry a content version, so a new index is written alongside
+    the old one and putting its metadata item switches readers over at once.
+    """
+    exam_type: str
+    count: int
+    # (topic, first position, number of questions)
+    topics: List[Tuple[str, int, int]]
+    shard_count: int
+    # Content hash of the packed IDs; empty for indexes written before shards were versioned
+    version: str = ""
+
+    @staticmethod
+    def partition_key(exam_type: str) -> str:
+        """DynamoDB partition key of the index metadata item"""
+        return f"EXAM_INDEX#{exam_type}"
+
+    def shard_key(self, shard: int) -> str:
+        """DynamoDB partition key of one shard of this version of the index"""
+        key = self.partition_key(self.exam_type)
+        return f"{key}#{self.version}#{shard}" if self.version else f"{key}#{shard}"
+
+    @classmethod
+    def build(cls, exam_type: str, questions: Iterable[Question]) -> Tuple['ExamIndex', List[bytes]]:
+        """Pack question IDs by topic, returning the index and its shards"""
+        by_topic: Dict[str, List[Question]] = {}
+        for question in questions:
+            by_topic.setdefault(question.topic or "", []).append(question)
+
+        packed = bytearray()
+        topics = []
+        for topic in sorted(by_topic, key=lambda t: (len(t), t)):
+            members = sorted(by_topic[topic], key=lambda q: (len(q.question_number), q.question_number))
+            topics.append((topic, len(packed) // ID_BYTES, len(members)))
+            for question in members:
+                packed += uuid.UUID(question.id).bytes
+
+        shard_bytes = IDS_PER_SHARD * ID_BYTES
+        shards = [bytes(packed[i:i + shard_bytes]) for i in range(0, len(packed), shard_bytes)]
+        index = cls(exam_type=exam_type, count=len(packed) // ID_BYTES, topics=topics, shard_count=len(shards),
+                    # Content-addressed, so identical re-ingests rewrite the same shard keys
+                    version=hashlib.sha256(packed).hexdigest()[:16])
+        return index, shards
+
+    def sample_positions(self, k: int, seed: Optional[str] = None, stratify: bool = False) -> List[int]:
+        """
+        Pick k distinct positions in O(k), reproducibly for a given seed
+
+        With stratify, each topic gets a share of k proportional to its size
+        (largest remainder), so a draw mirrors the bank's topic mix.
+        """
+        k = min(k, self.count)
+        rng = random.Random(seed)
+
+        if not stratify or len(self.topics) < 2:
+            return rng.sample(range(self.count), k)
+
+        quotas = [(k * size / self.count, topic_index) for topic_index, (_, _, size) in enumerate(self.topics)]
+        allocation = [int(quota) for quota, _ in quotas]
+        for _, topic_index in sorted(quotas, key=lambda q: q[0] - int(q[0]), reverse=True)[:k - sum(allocation)]:
+            allocation[topic_index] += 1
+
+        positions = []
+        for (_, start, size), take in zip(self.topics, allocation):
+            positions.extend(rng.sample(range(start, start + size), take))
+        rng.shuffle(positions)
+        return positions
+
+    @staticmethod
+    def shard_of(position: int) -> int:
+        """Shard holding a position"""
+        return position // IDS_PER_SHARD
+
+    @staticmethod
+    def id_at(shard: bytes, position: int) -> str:
+        """Question ID at a global position, read from the shard holding it"""
+        offset = (position % IDS_PER_SHARD) * ID_BYTES
+        return str(uuid.UUID(bytes=shard[offset:offset + ID_BYTES]))
+
+    def to_dynamodb_item(self) -> Dict:
+        """Convert the index metadata to DynamoDB item format"""
+        return {
+            "PK": {"S": self.partition_key(self.exam_type)},
+            "exam_type": {"S": self.exam_type},
+            "count": {"N": str(self.count)},
+            "shard_count": {"N": str(self.shard_count)},
+            "version": {"S": self.version},
+            "topics": {"L": [
+                {"M": {"topic": {"S": topic}, "start": {"N": str(start)}, "size": {"N": str(size)}}}
+                for topic, start, size in self.topics
+            ]}
+        }
+
+    def shard_items(self, shards: List[bytes]) -> List[Dict]:
+        """DynamoDB items holding the packed ID shards"""
+        return [
+            {"PK": {"S": self.shard_key(shard)}, "ids": {"B": ids}}
+            for shard, ids in enumerate(shards)
+        ]
+
+    @classmethod
+    def from_dynamodb_item(cls, item: Dict) -> 'ExamIndex':
+        """Build the index metadata from a DynamoDB item"""
+        return cls(
+            exam_type=item["exam_type"]["S"],
+            count=int(item["count"]["N"]),
+            topics=[
+                (entry["M"]["topic"]["S"], int(entry["M"]["start"]["N"]), int(entry["M"]["size"]["N"]))
+                for entry in item["topics"]["L"]
+            ],
+            shard_count=int(item["shard_count"]["N"]),
+            version=item.get("version", {}).get("S", "")
+        )
@@ -0,0 +1,85 @@
+"""
+Precomputed, compressed exam-set snapshot served by GET /questions
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import hashlib
+from typing import Dict, List, Optional
+
+from .question import Question
+from .question_codec import encode_question_item, encode_questions_body
+
+try:
+    import brotli
+except ImportError:  # Optional, gzip is always produced
+    brotli = None
+
+
+@dataclass
+class ExamSnapshot:
+    """Full question set of one exam type, serialized once at ingest time"""
+    exam_type: str
+    etag: str
+    count: int
+    body_gzip: bytes
+    body_br: Optional[bytes] = None
+    created_at: str = ""
+
+    @staticmethod
+    def partition_key(exam_type: str) -> str:
+        """DynamoDB partition key value for an exam type's snapshot"""
+        return f"SNAPSHOT#{exam_type}"
+
+    @classmethod
+    def build(cls, exam_type: str, questions: List[Question]) -> 'ExamSnapshot':
+        """Serialize questions exactly as GET /questions would return them, then compress"""
+        items = sorted((q.to_dynamodb_item() for q in questions), key=lambda item: item["GSI1SK"]["S"])
+        body = encode_questions_body(
+            [encode_question_item(item) for item in items],
+            count=len(items),
+            exam_type=exam_type,
+            next_token=None
+        ).encode("utf-8")
+
+        return cls(
+            exam_type=exam_type,
+            # Content-addressed, so identical re-ingests keep the same ETag
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            count=len(items),
+            body_gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            body_br=brotli.compress(body, quality=11) if brotli is not None else None,
+            created_at=datetime.now(timezone.utc).isoformat()
+        )
+
+    def body(self) -> bytes:
+        """Uncompressed JSON body"""
+        return gzip.decompress(self.body_gzip)
+
+    def to_dynamodb_item(self) -> Dict:
+        """Convert to DynamoDB item format"""
+        item = {
+            "PK": {"S": self.partition_key(self.exam_type)},
+            "exam_type": {"S": self.exam_type},
+            "etag": {"S": self.etag},
+            "count": {"N": str(self.count)},
+            "body_gzip": {"B": self.body_gzip},
+            "created_at": {"S": self.created_at}
+        }
+
+        if self.body_br:
+            item["body_br"] = {"B": self.body_br}
+
+        return item
+
+    @classmethod
+    def from_dynamodb_item(cls, item: Dict) -> 'ExamSnapshot':
+        """Build a snapshot from a DynamoDB item"""
+        return cls(
+            exam_type=item["exam_type"]["S"],
+            etag=item["etag"]["S"],
+            count=int(item["count"]["N"]),
+            body_gzip=item["body_gzip"]["B"],
+            body_br=item["body_br"]["B"] if "body_br" in item else None,
+            created_at=item["created_at"]["S"]
+        )
@@ -2,20 +2,28 @@
 Question data model for AWS Mock Test Platform
 """
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import uuid
 
 
-@dataclass
+# Namespace for deterministic question IDs (uuid5)
+QUESTION_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "aws-mock-test/questions")
+
+
+@dataclass(slots=True)
 class QuestionOption:
     """Represents a single answer option"""
     letter: str
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
-    """Question data model compatible with DynamoDB"""
+    """
+    Question data model compatible with DynamoDB
+    
+    Slotted to keep per-instance overhead low when large banks are held in memory.
+    """
     id: str
     question_number: str
     question_text: str
@@ -24,20 +32,91 @@ class Question:
     source_page: int
     correct_answer: Optional[str] = None
     exam_type: str = "AWS-SAA-C03"
+    topic: Optional[str] = None
+    
+    @staticmethod
+    def partition_key(question_id: str) -> str:
+        """DynamoDB partition key value for a question ID"""
+        return f"QUESTION#{question_id}"
+    
+    @staticmethod
+    def stable_id(exam_type: str, question_number: str, question_text: str) -> str:
+        """
+        Derive a deterministic ID from exam type, question number and normalized text
+        
+        Re-extracting the same question always yields the same ID, so re-ingestion
+        can diff against the table instead of rewriting it.
+        """
+        normalized_text = ' '.join(question_text.split()).casefold()
+        return str(uuid.uuid5(QUESTION_ID_NAMESPACE, f"{exam_type}|{question_number}|{normalized_text}"))
     
     @classmethod
     def create_new(cls, question_number: str, question_text: str, 
-                   options: List[QuestionOption], source_page: int) -> 'Question':
-        """Factory method to create a new question with auto-generated ID"""
+                   options: List[QuestionOption], source_page: int,
+                   exam_type: str = "AWS-SAA-C03", topic: Optional[str] = None) -> 'Question':
+        """Factory method to create a new question with a deterministic ID"""
         return cls(
-            id=str(uuid.uuid4()),
+            id=cls.stable_id(exam_type, question_number, question_text),
             question_number=question_number,
             question_text=question_text,
             options=options,
             correct_count=1,  # Default to single correct answer
-            source_page=source_page
+            source_page=source_page,
+            exam_type=exam_type,
+            topic=topic
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Question':
+        """Build a question from the to_dict format"""
+        return cls(
+            id=data["id"],
+            question_number=data["question_number"],
+            question_text=data["question_text"],
+            options=[QuestionOption(opt["letter"], opt["text"]) for opt in data.get("options", [])],
+            correct_count=data["correct_count"],
+            source_page=data["source_page"],
+            correct_answer=data.get("correct_answer"),
+            exam_type=data.get("exam_type", "AWS-SAA-C03"),
+            topic=data.get("topic")
+        )
+    
+    @classmethod
+    def from_dynamodb_item(cls, item: Dict) -> 'Question':
+        """Build a question from the to_dynamodb_item format"""
+        options = item.get("options")
+        correct_answer = item.get("correct_answer")
+        topic = item.get("topic")
+        return cls(
+            id=item["id"]["S"],
+            question_number=item["question_number"]["S"],
+            question_text=item["question_text"]["S"],
+            options=[
+                QuestionOption(opt["M"]["letter"]["S"], opt["M"]["text"]["S"])
+                for opt in options["L"]
+            ] if options else [],
+            correct_count=int(item["correct_count"]["N"]),
+            source_page=int(item["source_page"]["N"]),
+            correct_answer=correct_answer["S"] if correct_answer else None,
+            exam_type=item["exam_type"]["S"],
+            topic=topic["S"] if topic else None
         )
     
+    @property
+    def pk(self) -> str:
+        """DynamoDB partition key (PK)"""
+        return self.partition_key(self.id)
+    
+    @property
+    def sk(self) -> str:
+        """DynamoDB sort key (SK), also used as GSI1SK"""
+        return f"Q#{self.question_number}"
+    
+    @property
+    def gsi1pk(self) -> str:
+        """GSI1 partition key grouping questions by exam type"""
+        return f"EXAM#{self.exam_type}"
+    
     def to_dict(self) -> Dict:
         """Convert to regular dictionary format"""
         return {
@@ -48,16 +127,19 @@ class Question:
             "correct_count": self.correct_count,
             "correct_answer": self.correct_answer,
             "source_page": self.source_page,
-            "exam_type": self.exam_type
+            "exam_type": self.exam_type,
+            "topic": self.topic
         }
     
     def to_dynamodb_item(self) -> Dict:
         """Convert to DynamoDB item format"""
+        # Keys are cheap f-strings; caching them per instance would cost more memory than slots save
+        sk = self.sk
         item = {
-            "PK": {"S": f"QUESTION#{self.id}"},
-            "SK": {"S": f"Q#{self.question_number}"},
-            "GSI1PK": {"S": f"EXAM#{self.exam_type}"},
-            "GSI1SK": {"S": f"Q#{self.question_number}"},
+            "PK": {"S": self.pk},
+            "SK": {"S": sk},
+            "GSI1PK": {"S": self.gsi1pk},
+            "GSI1SK": {"S": sk},
             "id": {"S": self.id},
             "question_number": {"S": self.question_number},
             "question_text": {"S": self.question_text},
@@ -80,5 +162,32 @@ class Question:
         
         if self.correct_answer:
             item["correct_answer"] = {"S": self.correct_answer}
+        
+        if self.topic:
+            item["topic"] = {"S": self.topic}
             
         return item
+
+
+def questions_to_dicts(questions: Iterable[Question]) -> List[Dict]:
+    """Convert many questions with to_dict"""
+    to_dict = Question.to_dict
+    return [to_dict(q) for q in questions]
+
+
+def questions_to_dynamodb_items(questions: Iterable[Question]) -> List[Dict]:
+    """Convert many questions with to_dynamodb_item"""
+    to_dynamodb_item = Question.to_dynamodb_item
+    return [to_dynamodb_item(q) for q in questions]
+
+
+def questions_from_dicts(data: Iterable[Dict]) -> List[Question]:
+    """Build many questions with Question.from_dict"""
+    from_dict = Question.from_dict
+    return [from_dict(item) for item in data]
+
+
+def questions_from_dynamodb_items(items: Iterable[Dict]) -> List[Question]:
+    """Build many questions with Question.from_dynamodb_item"""
+    from_dynamodb_item = Question.from_dynamodb_item
+    return [from_dynamodb_item(item) for item in items]
@@ -0,0 +1,74 @@
+"""
+Schema-driven codec from DynamoDB question items to the API response shape
+
+Mirrors Question.to_dynamodb_item: items are decoded straight into response
+dicts without building intermediate Question objects. JSON encoding uses
+orjson when it is installed and falls back to the standard library.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON backend
+    orjson = None
+
+
+# Reused so the stdlib path does not build a new encoder per call
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# (attribute name, DynamoDB type tag, converter) in response field order
+QUESTION_ITEM_SCHEMA = (
+    ('id', 'S', None),
+    ('question_number', 'S', None),
+    ('question_text', 'S', None),
+    ('correct_count', 'N', int),
+    ('source_page', 'N', int),
+    ('exam_type', 'S', None)
+)
+
+
+def decode_question_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a DynamoDB question item into the API response dict"""
+    question = {}
+    for name, type_tag, convert in QUESTION_ITEM_SCHEMA:
+        value = item[name][type_tag]
+        question[name] = convert(value) if convert else value
+
+    correct_answer = item.get('correct_answer')
+    question['correct_answer'] = correct_answer['S'] if correct_answer else None
+
+    topic = item.get('topic')
+    question['topic'] = topic['S'] if topic else None
+
+    # Add options if present
+    options = item.get('options')
+    if options is not None:
+        question['options'] = [
+            {'letter': option['letter']['S'], 'text': option['text']['S']}
+            for option in (opt['M'] for opt in options['L'])
+        ]
+
+    return question
+
+
+def encode_json(value: Any) -> str:
+    """Serialize a value to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return _JSON_ENCODER.encode(value)
+
+
+def encode_question_item(item: Dict[str, Any]) -> str:
+    """Decode and serialize a DynamoDB question item in one step"""
+    return encode_json(decode_question_item(item))
+
+
+def encode_questions_body(encoded_questions: List[str], **fields: Optional[Any]) -> str:
+    """Splice already encoded questions into a {"questions": [...], **fields} JSON body"""
+    body = '{"questions":[' + ','.join(encoded_questions) + ']'
+    if fields:
+        body += ',' + encode_json(fields)[1:]
+    else:
+        body += '}'
+    return body
@@ -0,0 +1,174 @@
+"""
+Near-duplicate question detection with MinHash and locality-sensitive hashing
+"""
+from dataclasses import dataclass, field
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import zlib
+
+from ..models.question import Question
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MASK64 = (1 << 64) - 1
+_EMPTY_BIN = 1 << 64
+
+
+@dataclass
+class DuplicateCluster:
+    """A kept question and the near-duplicates merged into it"""
+    representative: Question
+    duplicates: List[Question] = field(default_factory=list)
+    similarities: List[float] = field(default_factory=list)
+
+
+class DuplicateDetector:
+    """
+    Finds questions whose text and options are near-identical across dumps
+
+    Each question is shingled into word n-grams of its normalized text and
+    option texts (as a set, so option order does not matter), summarised by a
+    MinHash signature and bucketed by LSH bands. Only questions sharing a band
+    bucket are compared, which keeps the work roughly linear in the number of
+    questions. Questions are only compared within the same exam type.
+
+    Signatures use one-permutation hashing: every shingle is hashed once and
+    lands in one of num_perm bins, keeping the minimum per bin; empty bins are
+    filled from their right neighbour (rotation densification). That costs one
+    hash per shingle instead of num_perm.
+
+    Questions without any word shingles (empty or failed parses) have nothing
+    to compare and are never treated as duplicates.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, seed: int = 0x9E3779B97F4A7C15):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+    def shingles(self, question: Question) -> List[int]:
+        """64-bit hashes of the word n-grams of the question text and every option text"""
+        shingle_hashes = set()
+        seed = self.seed
+        for text in [question.question_text] + [opt.text for opt in question.options]:
+            words = _WORD_RE.findall(text.casefold())
+            if not words:
+                continue
+            size = min(self.shingle_size, len(words))
+            for i in range(len(words) - size + 1):
+                # crc32 spread to 64 bits with the splitmix64 finalizer
+                h = (zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) + seed) & _MASK64
+                h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+                h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+                shingle_hashes.add(h ^ (h >> 31))
+        return list(shingle_hashes)
+
+    def signature(self, question: Question) -> Optional[Tuple[int, ...]]:
+        """One-permutation MinHash signature of a question's shingles, None if it has none"""
+        num_perm = self.num_perm
+        bins = [_EMPTY_BIN] * num_perm
+        for h in self.shingles(question):
+            index = h % num_perm
+            if h < bins[index]:
+                bins[index] = h
+
+        filled = [i for i, value in enumerate(bins) if value != _EMPTY_BIN]
+        if not filled:
+            return None
+
+        # Rotation densification: borrow the next filled bin to the right, tagged by distance
+        if len(filled) < num_perm:
+            signature = list(bins)
+            next_filled = filled[0] + num_perm
+            for i in range(num_perm - 1, -1, -1):
+                if bins[i] != _EMPTY_BIN:
+                    next_filled = i
+                else:
+                    distance = next_filled - i
+                    signature[i] = bins[next_filled % num_perm] + distance * _EMPTY_BIN
+            return tuple(signature)
+
+        return tuple(bins)
+
+    def similarity(self, left: Sequence[int], right: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for x, y in zip(left, right) if x == y) / self.num_perm
+
+    def find_clusters(self, questions: Sequence[Question], max_bucket_compare: int = 50) -> List[DuplicateCluster]:
+        """
+        Group near-duplicate questions; the earliest question of a group is its representative
+
+        Buckets larger than max_bucket_compare only compare members against the
+        bucket's first member, bounding the work on very common shingles.
+        """
+        signatures = [self.signature(question) for question in questions]
+
+        buckets: Dict[tuple, List[int]] = {}
+        for index, (question, sig) in enumerate(zip(questions, signatures)):
+            if sig is None:
+                continue
+            for band in range(self.bands):
+                key = (question.exam_type, band, sig[band * self.rows:(band + 1) * self.rows])
+                buckets.setdefault(key, []).append(index)
+
+        parent = list(range(len(questions)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        best_similarity: Dict[int, float] = {}
+        compared = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for position, index in enumerate(members[1:], start=1):
+                others = members[:position] if len(members) <= max_bucket_compare else members[:1]
+                for other in others:
+                    pair = (other, index)
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+
+                    score = self.similarity(signatures[other], signatures[index])
+                    if score >= self.threshold:
+                        root_a, root_b = find(other), find(index)
+                        if root_a != root_b:
+                            # The lower index (earliest question) stays the root
+                            parent[max(root_a, root_b)] = min(root_a, root_b)
+                        best_similarity[index] = max(best_similarity.get(index, 0.0), score)
+
+        clusters: Dict[int, DuplicateCluster] = {}
+        for index, question in enumerate(questions):
+            root = find(index)
+            if root == index:
+                continue
+            cluster = clusters.setdefault(root, DuplicateCluster(representative=questions[root]))
+            cluster.duplicates.append(question)
+            cluster.similarities.append(best_similarity.get(index, self.threshold))
+
+        return list(clusters.values())
+
+    def dedupe(self, questions: Iterable[Question]) -> Tuple[List[Question], List[DuplicateCluster]]:
+        """Drop near-duplicates, keeping each cluster's representative in input order"""
+        questions = list(questions)
+        clusters = self.find_clusters(questions)
+
+        duplicate_ids = set()
+        for cluster in clusters:
+            for duplicate in cluster.duplicates:
+                duplicate_ids.add(id(duplicate))
+                # Keep an answer key if only a duplicate carried one
+                if not cluster.representative.correct_answer and duplicate.correct_answer:
+                    cluster.representative.correct_answer = duplicate.correct_answer
+
+        return [q for q in questions if id(q) not in duplicate_ids], clusters
@@ -0,0 +1,102 @@
+"""
+On-disk, content-hash-keyed cache of extracted PDF pages
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..models.question import QuestionOption
+
+
+# One parsed question per tuple: (question_number, content, options, header_start)
+PageTokens = List[Tuple[str, str, List[QuestionOption], int]]
+
+
+class ExtractionCache:
+    """
+    Stores each page's extracted text and parsed questions under a key derived
+    from the page's content stream and the parser version, so unchanged pages
+    are never re-extracted or re-parsed. Least recently used entries are evicted
+    once the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir: str | Path = ".extraction_cache", max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def page_key(content: bytes, parser_fingerprint: str) -> str:
+        """Build the cache key for a page's content stream under a given parser"""
+        digest = hashlib.sha256(parser_fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, PageTokens]]:
+        """Return (text, tokens) for a cached page, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        self.hits += 1
+
+        tokens = [
+            (number, content, [QuestionOption(letter=letter, text=text) for letter, text in options], header_start)
+            for number, content, options, header_start in entry["tokens"]
+        ]
+        return entry["text"], tokens
+
+    def put(self, key: str, text: str, tokens: PageTokens) -> None:
+        """Store a page's text and tokens, replacing the entry atomically"""
+        entry = {
+            "text": text,
+            "tokens": [
+                [number, content, [[opt.letter, opt.text] for opt in options], header_start]
+                for number, content, options, header_start in tokens
+            ]
+        }
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits max_bytes; returns entries removed"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def clear(self) -> None:
+        """Invalidate every cached page"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,370 @@
+"""
+Concurrent batch ingestion of a directory of PDFs
+
+Files are extracted in worker processes that stream pages and send questions
+back in batches as they are parsed, through a bounded queue per file; from
+there batches flow through bounded asyncio queues: extract -> validate ->
+sinks. A full queue blocks the stage feeding it, down to the worker reading
+pages, so a slow sink (e.g. a throttled table) slows extraction down instead
+of piling questions up in memory.
+
+Per-file status is written to a state file after every change. Re-running the
+same command skips files already ingested unchanged, so a crashed run resumes
+where it stopped; files that were mid-flight are simply ingested again, which
+is safe because question IDs are stable and every sink overwrites.
+"""
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import queue
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models.question import Question
+from ..models.question_codec import encode_json
+from ..utils import metrics
+from ..utils.bulk_loader import BulkLoader
+from ..utils.db_utils import DynamoDBUtils
+from .pdf_service import PDFService
+from .quality_service import BatchValidator
+from .question_service import QuestionService, _open_text
+
+
+PENDING = "pending"
+EXTRACTING = "extracting"
+DONE = "done"
+FAILED = "failed"
+
+
+def _extract_file(pdf_path: str, results: Any, batch_size: int) -> int:
+    """
+    Worker process entry point: stream one PDF's questions into results in batches
+
+    results is a bounded queue, so a worker whose batches are not consumed
+    blocks instead of parsing ahead. None is always sent last, also on failure;
+    the error itself surfaces through the worker's future.
+    """
+    count = 0
+    try:
+        # Timings recorded in a worker would die with it, so each file is reported on its own line
+        with metrics.recording({"Service": "ingest", "Stage": "extract"}, file=pdf_path):
+            batch = []
+            for question in PDFService().iter_questions_streaming(pdf_path):
+                batch.append(question)
+                if len(batch) >= batch_size:
+                    results.put(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                results.put(batch)
+                count += len(batch)
+            metrics.count("questions", count)
+    finally:
+        results.put(None)
+    return count
+
+
+def _receive_batch(results: Any, worker: Future) -> Optional[List[Question]]:
+    """Next batch from a worker's queue, or None once it is done (also if it died without saying so)"""
+    while True:
+        try:
+            return results.get(timeout=0.5)
+        except queue.Empty:
+            if worker.done():
+                return None
+
+
+def file_fingerprint(path: Path) -> str:
+    """Cheap change detector for resumability: size and modification time"""
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+@dataclass
+class QuestionBatch:
+    """A slice of one file's questions; the last slice of a file has final=True"""
+    path: str
+    name: str  # path relative to the input directory
+    questions: List[Question]
+    final: bool = False
+    invalid: int = 0
+
+
+@dataclass
+class IngestSummary:
+    """End-of-run counters"""
+    files: int = 0
+    skipped: int = 0
+    done: int = 0
+    failed: int = 0
+    questions: int = 0
+    invalid: int = 0
+    input_bytes: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def report(self) -> str:
+        """Human readable throughput summary"""
+        elapsed = self.elapsed or 1e-9
+        return (
+            f"📊 Ingest summary: {self.done} done, {self.skipped} skipped, {self.failed} failed "
+            f"of {self.files} files in {self.elapsed:.1f}s\n"
+            f"   - Questions written: {self.questions} ({self.questions / elapsed:,.0f}/s)\n"
+            f"   - Questions dropped as invalid: {self.invalid}\n"
+            f"   - Files/s: {self.done / elapsed:.2f}, input MB/s: {self.input_bytes / elapsed / 1e6:.2f}"
+        )
+
+
+class IngestState:
+    """Per-file status persisted as JSON so interrupted runs can resume"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.files = json.load(f).get("files", {})
+
+    def is_done(self, pdf_path: str, fingerprint: str) -> bool:
+        entry = self.files.get(pdf_path)
+        return entry is not None and entry["status"] == DONE and entry["fingerprint"] == fingerprint
+
+    def update(self, pdf_path: str, **fields: Any) -> None:
+        """Record status fields for a file and persist the state atomically"""
+        self.files.setdefault(pdf_path, {}).update(fields)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class JsonlSink:
+    """Writes each PDF's questions to <output_dir>/<relative pdf path>.jsonl[.gz]"""
+
+    def __init__(self, output_dir: str | Path, compress: bool = True):
+        self.output_dir = Path(output_dir)
+        self.suffix = ".jsonl.gz" if compress else ".jsonl"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, name: str) -> Tuple[Path, Path]:
+        """Final output path and the temp path it is assembled in"""
+        path = (self.output_dir / name).with_suffix(self.suffix)
+        return path, path.with_name(f".{path.name}.partial{path.suffix}")
+
+    @metrics.timed_stage("jsonl_write")
+    def write(self, batch: QuestionBatch) -> None:
+        path, tmp_path = self._paths(batch.name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Appended to a temp file and renamed once complete, so outputs are never partial
+        with _open_text(tmp_path, "a") as f:
+            for question in batch.questions:
+                f.write(encode_json(question.to_dict()))
+                f.write("\n")
+        if batch.final:
+            os.replace(tmp_path, path)
+
+    def discard(self, name: str) -> None:
+        """Drop a partial output left by an earlier attempt"""
+        self._paths(name)[1].unlink(missing_ok=True)
+
+    def close(self) -> None:
+        pass
+
+
+class DynamoDBSink:
+    """
+    Puts questions into the table, then republishes the exam artifacts of the exam types written
+
+    Snapshots, packed ID indexes and (with search_index_path) the search index
+    are rebuilt at close from every question the table holds for those exam
+    types, so questions from earlier runs are kept, and the data version is
+    bumped once.
+    """
+
+    def __init__(self, db_utils: Optional[DynamoDBUtils] = None, max_workers: int = 8,
+                 search_index_path: Optional[str] = None):
+        self.db_utils = db_utils or DynamoDBUtils()
+        self.loader = BulkLoader(self.db_utils.table_name, dynamodb=self.db_utils.dynamodb,
+                                 max_workers=max_workers, progress=None)
+        self.search_index_path = search_index_path
+        self.written = 0
+        self.exam_types = set()
+
+    @metrics.timed_stage("dynamodb_write")
+    def write(self, batch: QuestionBatch) -> None:
+        if batch.questions:
+            self.written += self.loader.put_items([q.to_dynamodb_item() for q in batch.questions]).written
+            self.exam_types.update(q.exam_type for q in batch.questions)
+
+    def discard(self, name: str) -> None:
+        pass
+
+    @metrics.timed_stage("publish")
+    def close(self) -> None:
+        if not self.written:
+            return
+        questions = [Question.from_dynamodb_item(item)
+                     for exam_type in sorted(self.exam_types)
+                     for item in self.db_utils.query_exam_items(exam_type)]
+        QuestionService().publish_exam_artifacts(self.db_utils, questions, self.search_index_path)
+
+
+class BatchIngestPipeline:
+    """
+    Ingests every PDF in a directory through extract -> validate -> sink stages
+
+    workers processes extract files concurrently; queue_size bounds the batches
+    waiting between stages and batch_size the questions per batch.
+    """
+
+    def __init__(self, sinks: Sequence[Any], state: IngestState, workers: int = 4,
+                 queue_size: int = 8, batch_size: int = 500, validate: bool = False,
+                 suffix: str = ".pdf"):
+        self.sinks = list(sinks)
+        self.state = state
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.suffix = suffix.lower()
+        self.validator = BatchValidator() if validate else None
+
+    def run(self, input_dir: str | Path) -> IngestSummary:
+        """Ingest a directory, blocking until every file is done or failed"""
+        return asyncio.run(self._run(Path(input_dir)))
+
+    async def _run(self, input_dir: Path) -> IngestSummary:
+        summary = IngestSummary()
+        # Matched on the suffix, case-insensitively, so report.PDF is picked up too
+        pdf_paths = sorted(path for path in input_dir.rglob("*")
+                           if path.suffix.lower() == self.suffix and path.is_file())
+        summary.files = len(pdf_paths)
+
+        todo = []
+        for path in pdf_paths:
+            fingerprint = file_fingerprint(path)
+            if self.state.is_done(str(path), fingerprint):
+                summary.skipped += 1
+                continue
+            todo.append(path)
+            self.state.update(str(path), status=PENDING, fingerprint=fingerprint)
+
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        validated: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        slots = asyncio.Semaphore(self.workers)
+
+        # Workers reach the per-file queues through the manager; one receiver thread per active file
+        with multiprocessing.Manager() as manager, \
+                ProcessPoolExecutor(max_workers=self.workers) as executor, \
+                ThreadPoolExecutor(max_workers=self.workers) as receivers:
+            extractors = [
+                asyncio.create_task(self._extract(path, str(path.relative_to(input_dir)), manager, executor,
+                                                  receivers, slots, extracted, summary))
+                for path in todo
+            ]
+            validator = asyncio.create_task(self._validate(extracted, validated, summary))
+            writer = asyncio.create_task(self._write(validated, summary))
+
+            await asyncio.gather(*extractors)
+            await extracted.put(None)
+            await validator
+            await writer
+
+        for sink in self.sinks:
+            sink.close()
+
+        summary.finished_at = time.perf_counter()
+        return summary
+
+    async def _extract(self, path: Path, name: str, manager: Any, executor: ProcessPoolExecutor,
+                       receivers: ThreadPoolExecutor, slots: asyncio.Semaphore,
+                       extracted: asyncio.Queue, summary: IngestSummary) -> None:
+        """Extract one file in a worker process, enqueueing its questions batch by batch as they arrive"""
+        loop = asyncio.get_running_loop()
+        async with slots:
+            started = time.perf_counter()
+            self.state.update(str(path), status=EXTRACTING, started_at=time.time())
+            for sink in self.sinks:
+                sink.discard(name)
+
+            results = manager.Queue(maxsize=self.queue_size)
+            worker = executor.submit(_extract_file, str(path), results, self.batch_size)
+
+            # One batch is held back until the next arrives, so the last one can be marked final.
+            # Waits on extracted whenever the downstream stages fall behind.
+            held = None
+            while (questions := await loop.run_in_executor(receivers, _receive_batch, results, worker)) is not None:
+                if held is not None:
+                    await extracted.put(QuestionBatch(path=str(path), name=name, questions=held))
+                held = questions
+
+            try:
+                await asyncio.wrap_future(worker)
+            except Exception as e:
+                summary.failed += 1
+                self.state.update(str(path), status=FAILED, error=str(e))
+                print(f"❌ {path.name}: {e}")
+                return
+
+            summary.input_bytes += path.stat().st_size
+            self.state.update(str(path), extract_seconds=round(time.perf_counter() - started, 3))
+            await extracted.put(QuestionBatch(path=str(path), name=name, questions=held or [], final=True))
+
+    async def _validate(self, extracted: asyncio.Queue, validated: asyncio.Queue, summary: IngestSummary) -> None:
+        """Drop questions failing error-level checks when validation is enabled"""
+        loop = asyncio.get_running_loop()
+        while (batch := await extracted.get()) is not None:
+            if self.state.files[batch.path]["status"] == FAILED:
+                continue
+            if self.validator is not None and batch.questions:
+                try:
+                    report = await loop.run_in_executor(None, self.validator.validate, batch.questions)
+                except Exception as e:
+                    # Fail the file, not the stage: a dead validator would block every extractor
+                    summary.failed += 1
+                    self.state.update(batch.path, status=FAILED, error=str(e))
+                    print(f"❌ {Path(batch.path).name}: {e}")
+                    continue
+                invalid_ids = set(report.invalid_ids)
+                if invalid_ids:
+                    batch.questions = [q for q in batch.questions if q.id not in invalid_ids]
+                    batch.invalid = len(invalid_ids)
+                    summary.invalid += len(invalid_ids)
+            await validated.put(batch)
+        await validated.put(None)
+
+    async def _write(self, validated: asyncio.Queue, summary: IngestSummary) -> None:
+        """Hand batches to every sink; a file is done once its final batch is written"""
+        loop = asyncio.get_running_loop()
+        written: Dict[str, int] = {}
+        invalid: Dict[str, int] = {}
+        while (batch := await validated.get()) is not None:
+            if self.state.files[batch.path]["status"] == FAILED:
+                continue
+
+            try:
+                for sink in self.sinks:
+                    await loop.run_in_executor(None, sink.write, batch)
+            except Exception as e:
+                summary.failed += 1
+                self.state.update(batch.path, status=FAILED, error=str(e))
+                print(f"❌ {Path(batch.path).name}: {e}")
+                continue
+
+            written[batch.path] = written.get(batch.path, 0) + len(batch.questions)
+            invalid[batch.path] = invalid.get(batch.path, 0) + batch.invalid
+            summary.questions += len(batch.questions)
+
+            if batch.final:
+                summary.done += 1
+                self.state.update(batch.path, status=DONE, questions=written[batch.path],
+                                  invalid=invalid[batch.path], error=None, finished_at=time.time())
+                dropped = f" ({invalid[batch.path]} invalid dropped)" if invalid[batch.path] else ""
+                print(f"✅ {Path(batch.path).name}: {written[batch.path]} questions{dropped}")
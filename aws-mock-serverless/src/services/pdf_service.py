@@ -1,100 +1,353 @@
 """
 PDF processing service for extracting questions from AWS certification PDFs
 """
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
 from pathlib import Path
 from pypdf import PdfReader
+from pypdf.errors import EmptyFileError
 import re
-from typing import List, Generator, Tuple
+from typing import IO, Iterable, List, Generator, Optional, Tuple
 
 from ..models.question import Question, QuestionOption
+from ..utils import metrics
+from .extraction_cache import ExtractionCache, PageTokens
+
+
+# Bump whenever parsing output changes so cached pages are re-parsed
+PARSER_VERSION = "2"
+
+_NON_WHITESPACE = re.compile(r'\S')
+
+# "Question #12" or "Question # 12"; shared with the quality checks so the two cannot drift
+QUESTION_HEADER_PATTERN = r'Question\s+#\s*(\d+)'
+
+# Layout mode keeps the visual order: "Question #12 .... Topic 1" on one line
+_LAYOUT_HEADER = re.compile(QUESTION_HEADER_PATTERN + r'[ \t]+Topic\s+(\d+)')
+_LAYOUT_PADDING = re.compile(r'[ \t]*\n\s*')
+
+# The start of a question header cut off by the end of a page, e.g. "Topic 1" / "Question #12"
+_PARTIAL_HEADER = re.compile(r'Topic\s+\d+(?:\s*Question(?:\s+#?)?)?\s*$')
+
+
+def _open_reader(path: Path, stream: Optional[IO[bytes]] = None) -> PdfReader:
+    """Open a PDF (from an already open stream if given), decrypting it with an empty password if needed"""
+    reader = PdfReader(stream if stream is not None else path)
+    
+    # Handle encrypted PDFs
+    if getattr(reader, "is_encrypted", False):
+        try:
+            reader.decrypt("")
+        except Exception as e:
+            raise RuntimeError(f"Cannot open encrypted PDF: {path}") from e
+    
+    return reader
+
+
+def _extract_page_numbers(pdf_path: str, page_numbers: List[int]) -> List[Tuple[int, str]]:
+    """Worker entry point: extract the given 1-based pages with a reader of its own"""
+    reader = _open_reader(Path(pdf_path))
+    return [(num, reader.pages[num - 1].extract_text() or "") for num in page_numbers]
+
+
+def _page_content(page) -> bytes:
+    """Return a page's decoded content stream, used as its cache identity"""
+    contents = page.get_contents()
+    return contents.get_data() if contents is not None else b""
 
 
 class PDFService:
     """Service for processing PDF files and extracting questions"""
     
     def __init__(self):
-        self.question_pattern = r'Topic\s+\d+Question\s+#(\d+)'
+        # Whitespace is optional around "Question" so headers split over two lines still match
+        self.question_pattern = r'Topic\s+\d+\s*' + QUESTION_HEADER_PATTERN
         self.options_pattern = r'\n([A-Z])\.\s+'
+        # Question headers and option markers in one alternation so each page is scanned once
+        self._token_re = re.compile(f'(?:{self.question_pattern})|(?:{self.options_pattern})')
+        self._option_re = re.compile(self.options_pattern)
+        self._topic_re = re.compile(r'Topic\s+(\d+)')
+    
+    @property
+    def parser_fingerprint(self) -> str:
+        """Identifies the parser version and patterns that produced cached tokens"""
+        return f"{PARSER_VERSION}|{self.question_pattern}|{self.options_pattern}"
     
     def extract_pages(self, pdf_path: str | Path) -> Generator[Tuple[int, str], None, None]:
         """Extract text from PDF pages"""
-        path = Path(pdf_path)
-        reader = PdfReader(path)
-        
-        # Handle encrypted PDFs
-        if getattr(reader, "is_encrypted", False):
-            try:
-                reader.decrypt("")
-            except Exception as e:
-                raise RuntimeError(f"Cannot open encrypted PDF: {path}") from e
+        reader = _open_reader(Path(pdf_path))
         
         for i, page in enumerate(reader.pages, start=1):
-            text = page.extract_text() or ""
+            with metrics.stage("extract_page"):
+                text = page.extract_text() or ""
             yield i, text
     
-    def parse_questions_from_text(self, text: str, page_num: int) -> List[Question]:
-        """Parse questions from PDF text and return structured data"""
-        questions = []
+    def extract_pages_parallel(self, pdf_path: str | Path, workers: int,
+                               chunk_size: Optional[int] = None,
+                               page_numbers: Optional[List[int]] = None) -> Generator[Tuple[int, str], None, None]:
+        """Extract text from PDF pages (all, or the given 1-based pages) across a process pool, in order"""
+        path = Path(pdf_path)
+        if page_numbers is None:
+            page_numbers = list(range(1, len(_open_reader(path).pages) + 1))
         
-        # Find all question headers
-        question_matches = list(re.finditer(self.question_pattern, text))
+        # Several chunks per worker keeps the pool busy when pages differ in cost
+        chunk_size = chunk_size or max(1, -(-len(page_numbers) // (workers * 4)))
+        chunks = [page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
         
-        for i, match in enumerate(question_matches):
-            question_number = match.group(1)
-            
-            # Get the text for this question
-            start_pos = match.end()
-            end_pos = question_matches[i + 1].start() if i + 1 < len(question_matches) else len(text)
-            question_text = text[start_pos:end_pos].strip()
-            
-            # Parse question content and options
-            question_content, options = self._extract_question_and_options(question_text)
-            
-            # Create question object
-            question = Question.create_new(
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() returns results in submission order, i.e. page order
+            for pages in pool.map(_extract_page_numbers, [str(path)] * len(chunks), chunks):
+                yield from pages
+    
+    def stream_pages(self, pdf_path: str | Path, layout: bool = False,
+                     max_cached_objects: int = 5000) -> Generator[Tuple[int, str], None, None]:
+        """
+        Extract pages one at a time from a memory-mapped file with bounded memory
+        
+        The file is mapped rather than read, so the OS pages it in and out as
+        needed, and pypdf resolves objects lazily per page. Its resolved-object
+        cache is dropped whenever it grows past max_cached_objects, so resident
+        memory stays flat however long the document is. layout=True uses
+        pypdf's layout mode, which keeps text in visual reading order.
+        
+        The cache is pypdf's internal PdfReader.resolved_objects dict (present
+        through pypdf 6.x, which pyproject pins); if a release drops it, pages
+        are still streamed, just without the cap.
+        """
+        path = Path(pdf_path)
+        mode = "layout" if layout else "plain"
+        
+        # mmap refuses empty files; fail the way PdfReader does for them
+        if os.path.getsize(path) == 0:
+            raise EmptyFileError("Cannot read an empty file")
+        
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            reader = _open_reader(path, stream=mapped)
+            resolved_objects = getattr(reader, "resolved_objects", None)
+            if not isinstance(resolved_objects, dict):
+                resolved_objects = None
+            for i in range(len(reader.pages)):
+                with metrics.stage("extract_page"):
+                    text = reader.pages[i].extract_text(extraction_mode=mode) or ""
+                yield i + 1, self._normalize_layout_text(text) if layout else text
+                if resolved_objects is not None and len(resolved_objects) > max_cached_objects:
+                    resolved_objects.clear()
+    
+    def _normalize_layout_text(self, text: str) -> str:
+        """Drop layout padding and indentation and put headers in the "Topic N Question #M" order"""
+        text = _LAYOUT_PADDING.sub("\n", text).strip()
+        return _LAYOUT_HEADER.sub(r"Topic \2 Question #\1", text)
+    
+    def _rejoin_split_headers(self, pages: Iterable[Tuple[int, str]]) -> Generator[Tuple[int, str], None, None]:
+        """Move a question header cut off at the end of a page to the start of the next page"""
+        held = ""
+        for page_num, text in pages:
+            if held:
+                text = f"{held}\n{text}"
+            match = _PARTIAL_HEADER.search(text)
+            held = text[match.start():] if match else ""
+            yield page_num, text[:match.start()] if match else text
+    
+    def parse_questions_from_text(self, text: str, page_num: int) -> List[Question]:
+        """Parse questions from PDF text and return structured data"""
+        return [
+            Question.create_new(
                 question_number=question_number,
                 question_text=question_content,
                 options=options,
-                source_page=page_num
+                source_page=page_num,
+                topic=self._topic_at(text, header_start)
             )
+            for question_number, question_content, options, header_start in self._tokenize(text)
+        ]
+    
+    def _tokenize_page(self, text: str) -> PageTokens:
+        """Tokenize a whole page, timed as the "tokenize_page" stage"""
+        metrics.count("pages")
+        with metrics.stage("tokenize_page"):
+            return list(self._tokenize(text))
+    
+    def _topic_at(self, text: str, header_start: int) -> Optional[str]:
+        """Topic number from the "Topic N" question header starting at header_start"""
+        match = self._topic_re.match(text, header_start)
+        return match.group(1) if match else None
+    
+    def _tokenize(self, text: str) -> Generator[Tuple[str, str, List[QuestionOption], int], None, None]:
+        """
+        Walk the text once, yielding (question_number, content, options, header_start) per question
+        
+        Headers and options are tracked as offsets into the page text; strings are
+        only sliced out, with whitespace collapsed, when a question is complete.
+        """
+        token_re = self._token_re
+        current = None  # (question_number, header_start, content_start, [(letter, marker_start, letter_end, text_start)])
+        pos = 0
+        
+        while True:
+            match = token_re.search(text, pos)
+            if match is None:
+                break
             
-            questions.append(question)
+            question_number = match.group(1)
+            if question_number is not None:
+                if current is not None:
+                    yield self._build_question(text, current, match.start())
+                
+                # Question content starts at the first non-whitespace character after the header
+                content = _NON_WHITESPACE.search(text, match.end())
+                content_start = content.start() if content else len(text)
+                current = (question_number, match.start(), content_start, [])
+                pos = content_start
+            else:
+                if current is not None:
+                    current[3].append((match.group(2), match.start(), match.end(2) + 1, match.end()))
+                pos = match.end()
         
-        return questions
+        if current is not None:
+            yield self._build_question(text, current, len(text))
     
-    def _extract_question_and_options(self, question_text: str) -> Tuple[str, List[QuestionOption]]:
-        """Extract question content and options from text"""
-        options_matches = list(re.finditer(self.options_pattern, question_text))
+    def _build_question(self, text: str, current: Tuple, end: int) -> Tuple[str, str, List[QuestionOption], int]:
+        """Slice question content and options out of text[content_start:end]"""
+        question_number, header_start, content_start, markers = current
+        
+        # A trailing marker with nothing after it is part of the previous text, not an option
+        if markers and _NON_WHITESPACE.search(text, markers[-1][3], end) is None:
+            end = markers.pop()[2]
+        
+        if not markers:
+            # No options found, treat as the entire question text
+            return question_number, text[content_start:end].strip(), [], header_start
+        
+        question_content = ' '.join(text[content_start:markers[0][1]].split())
+        
         options = []
+        for j, (letter, _, _, text_start) in enumerate(markers):
+            option_end = markers[j + 1][1] if j + 1 < len(markers) else end
+            options.append(QuestionOption(letter=letter, text=' '.join(text[text_start:option_end].split())))
+        
+        return question_number, question_content, options, header_start
+    
+    def parse_pages(self, pages: Iterable[Tuple[int, str]]) -> List[Question]:
+        """
+        Parse pages in order, continuing questions that run onto the next page
+        
+        Text before the first header on a page normally is page furniture. It is
+        treated as the continuation of the previous page's last question when the
+        text carries further option markers, or when that question has no options
+        yet and its text stops mid-sentence (no closing '?' or '.').
+        """
+        return list(self._iter_tokenized_pages((page_num, text, self._tokenize_page(text))
+                                               for page_num, text in pages))
+    
+    def _iter_tokenized_pages(self, pages: Iterable[Tuple[int, str, PageTokens]]) -> Generator[Question, None, None]:
+        """
+        Yield questions from already tokenized pages, see parse_pages
         
-        if options_matches:
-            # Question text is everything before the first option
-            question_content = question_text[:options_matches[0].start()].strip()
-            question_content = re.sub(r'\s+', ' ', question_content)
+        The last question of each page is held back until the next page shows
+        whether it continues there.
+        """
+        pending = None  # last question seen, not yielded yet
+        carry = None  # (page_num, raw text of the last question on the previous page)
+        
+        for page_num, text, tokens in pages:
+            leading = text[:tokens[0][3]] if tokens else text
             
-            # Extract options
-            for j, option_match in enumerate(options_matches):
-                option_letter = option_match.group(1)
-                option_start = option_match.end()
-                option_end = options_matches[j + 1].start() if j + 1 < len(options_matches) else len(question_text)
-                option_text = question_text[option_start:option_end].strip()
-                
-                # Clean up option text
-                option_text = re.sub(r'\s+', ' ', option_text)
-                
-                options.append(QuestionOption(letter=option_letter, text=option_text))
+            if carry is not None and self._continues_question(pending, leading):
+                carry = (carry[0], f"{carry[1]}\n{leading}")
+                pending = self.parse_questions_from_text(carry[1], carry[0])[0]
+            elif not tokens:
+                carry = None
+            
+            if tokens:
+                questions = [
+                    Question.create_new(
+                        question_number=question_number,
+                        question_text=question_content,
+                        options=options,
+                        source_page=page_num,
+                        topic=self._topic_at(text, header_start)
+                    )
+                    for question_number, question_content, options, header_start in tokens
+                ]
+                if pending is not None:
+                    yield pending
+                yield from questions[:-1]
+                pending = questions[-1]
+                carry = (page_num, text[tokens[-1][3]:])
+        
+        if pending is not None:
+            yield pending
+    
+    def _continues_question(self, question: Question, leading: str) -> bool:
+        """Whether leading page text belongs to the question left open on the previous page"""
+        if _NON_WHITESPACE.search(leading) is None:
+            return False
+        if self._option_re.search(f"\n{leading}") is not None:
+            return True
+        # A question that already ends its sentence is complete; the text is page furniture
+        return not question.options and not question.question_text.rstrip(' )').endswith(('?', '.'))
+    
+    def extract_all_questions(self, pdf_path: str | Path, workers: int = 1,
+                              cache: Optional[ExtractionCache] = None) -> List[Question]:
+        """
+        Extract all questions from PDF file
+        
+        workers > 1 extracts pages in parallel; with a cache, only pages whose
+        content stream changed since the last run are extracted and parsed.
+        """
+        return list(self.iter_questions(pdf_path, workers=workers, cache=cache))
+    
+    def iter_questions(self, pdf_path: str | Path, workers: int = 1,
+                       cache: Optional[ExtractionCache] = None) -> Generator[Question, None, None]:
+        """Lazily yield the questions of a PDF file in page order, see extract_all_questions"""
+        if cache is not None:
+            yield from self._iter_tokenized_pages(self._extract_tokenized_pages_cached(pdf_path, workers, cache))
+            return
+        
+        if workers > 1:
+            pages = self.extract_pages_parallel(pdf_path, workers)
         else:
-            # No options found, treat as the entire question text
-            question_content = question_text
+            pages = self.extract_pages(pdf_path)
+        
+        yield from self._iter_tokenized_pages((page_num, text, self._tokenize_page(text))
+                                              for page_num, text in pages)
+    
+    def iter_questions_streaming(self, pdf_path: str | Path, layout: bool = False,
+                                 max_cached_objects: int = 5000) -> Generator[Question, None, None]:
+        """
+        Stream questions from a PDF of any size in one pass, see stream_pages
         
-        return question_content, options
+        Only the current page and the question left open at its end are held;
+        questions running onto the next page and headers split across pages
+        are stitched back together as pages arrive.
+        """
+        pages = self._rejoin_split_headers(self.stream_pages(pdf_path, layout, max_cached_objects))
+        yield from self._iter_tokenized_pages((page_num, text, self._tokenize_page(text))
+                                              for page_num, text in pages)
     
-    def extract_all_questions(self, pdf_path: str | Path) -> List[Question]:
-        """Extract all questions from PDF file"""
-        all_questions = []
+    def _extract_tokenized_pages_cached(self, pdf_path: str | Path, workers: int,
+                                        cache: ExtractionCache) -> List[Tuple[int, str, PageTokens]]:
+        """Tokenize every page, serving unchanged pages from the cache"""
+        reader = _open_reader(Path(pdf_path))
+        fingerprint = self.parser_fingerprint
+        
+        keys = {}
+        entries = {}
+        for page_num, page in enumerate(reader.pages, start=1):
+            keys[page_num] = cache.page_key(_page_content(page), fingerprint)
+            entries[page_num] = cache.get(keys[page_num])
+        
+        missing = [page_num for page_num, entry in entries.items() if entry is None]
+        if workers > 1 and len(missing) > 1:
+            extracted = self.extract_pages_parallel(pdf_path, workers, page_numbers=missing)
+        else:
+            extracted = ((page_num, reader.pages[page_num - 1].extract_text() or "") for page_num in missing)
         
-        for page_num, text in self.extract_pages(pdf_path):
-            questions = self.parse_questions_from_text(text, page_num)
-            all_questions.extend(questions)
+        for page_num, text in extracted:
+            tokens = self._tokenize_page(text)
+            cache.put(keys[page_num], text, tokens)
+            entries[page_num] = (text, tokens)
         
-        return all_questions
+        cache.prune()
+        return [(page_num, text, tokens) for page_num, (text, tokens) in sorted(entries.items())]
@@ -0,0 +1,203 @@
+"""
+Vectorized batch validation and per-page quality report for extracted questions
+
+Questions are flattened into columnar NumPy arrays once (one row per question,
+plus flat per-option arrays with a row index), and every check is a whole-array
+expression over them. Length outliers use the median/MAD modified z-score, so a
+handful of runaway options cannot drag the baseline with them.
+"""
+from dataclasses import dataclass, field
+import re
+from typing import Any, Dict, List, Sequence
+
+from ..models.question import Question
+from .pdf_service import QUESTION_HEADER_PATTERN
+
+try:
+    import numpy as np
+except ImportError:  # Optional, install the `quality` extra to use the batch validator
+    np = None
+
+
+# Checks that make a question unusable; anything else is a warning
+ERROR_CHECKS = (
+    "empty_text",
+    "missing_number",
+    "missing_options",
+    "too_few_options",
+    "duplicate_letters",
+    "non_contiguous_letters",
+    "invalid_correct_count",
+)
+WARNING_CHECKS = (
+    "runaway_option",
+    "swallowed_header",
+    "text_length_outlier",
+    "option_count_outlier",
+)
+
+# A question header inside an option means the parser missed the next question
+_HEADER_RE = re.compile(QUESTION_HEADER_PATTERN)
+
+
+@dataclass
+class PageQuality:
+    """Check failures for the questions extracted from one source page"""
+    questions: int = 0
+    errors: int = 0
+    warnings: int = 0
+    checks: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class QualityReport:
+    """Result of validating a question set in one batch"""
+    total: int
+    failures: Dict[str, List[str]]
+    pages: Dict[int, PageQuality]
+
+    @property
+    def invalid_ids(self) -> List[str]:
+        """IDs of questions failing at least one error-level check"""
+        return list(dict.fromkeys(
+            question_id for check in ERROR_CHECKS for question_id in self.failures.get(check, [])
+        ))
+
+    @property
+    def is_valid(self) -> bool:
+        return not any(self.failures.get(check) for check in ERROR_CHECKS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form of the report"""
+        return {
+            "total": self.total,
+            "invalid": len(self.invalid_ids),
+            "failures": self.failures,
+            "pages": {
+                str(page): {
+                    "questions": quality.questions,
+                    "errors": quality.errors,
+                    "warnings": quality.warnings,
+                    "checks": quality.checks
+                }
+                for page, quality in sorted(self.pages.items())
+            }
+        }
+
+
+class BatchValidator:
+    """Validates whole question sets with columnar checks"""
+
+    def __init__(self, outlier_z: float = 3.5, max_option_chars: int = 1500, min_options: int = 2):
+        if np is None:
+            raise ImportError("BatchValidator requires numpy; install the `quality` extra")
+
+        self.outlier_z = outlier_z
+        self.max_option_chars = max_option_chars
+        self.min_options = min_options
+
+    def validate(self, questions: Sequence[Question]) -> QualityReport:
+        """Run every check over the question set and build a per-page report"""
+        count = len(questions)
+
+        text_length = np.fromiter((len(q.question_text.strip()) for q in questions), dtype=np.int64, count=count)
+        has_number = np.fromiter((bool(q.question_number) for q in questions), dtype=bool, count=count)
+        correct_count = np.fromiter((q.correct_count for q in questions), dtype=np.int64, count=count)
+        option_count = np.fromiter((len(q.options) for q in questions), dtype=np.int64, count=count)
+        source_page = np.fromiter((q.source_page for q in questions), dtype=np.int64, count=count)
+
+        # Flat per-option columns; option_row maps each option back to its question
+        total_options = int(option_count.sum())
+        option_row = np.repeat(np.arange(count), option_count)
+        option_position = np.arange(total_options) - np.repeat(np.cumsum(option_count) - option_count, option_count)
+        option_texts = [opt.text for q in questions for opt in q.options]
+        letter_code = np.fromiter(
+            (ord(opt.letter[:1] or "\0") - ord("A") for q in questions for opt in q.options),
+            dtype=np.int64, count=total_options
+        )
+        option_length = np.fromiter((len(text) for text in option_texts), dtype=np.int64, count=total_options)
+
+        failed: Dict[str, Any] = {
+            "empty_text": text_length == 0,
+            "missing_number": ~has_number,
+            "missing_options": option_count == 0,
+            "too_few_options": (option_count > 0) & (option_count < self.min_options),
+            "invalid_correct_count": (correct_count < 1) | ((option_count > 0) & (correct_count > option_count)),
+        }
+
+        # Letters repeat when a (question, letter) pair occurs twice
+        pair = option_row * 256 + np.clip(letter_code, -1, 254) + 1
+        pairs, pair_counts = np.unique(pair, return_counts=True)
+        failed["duplicate_letters"] = self._rows(pairs[pair_counts > 1] // 256, count)
+
+        # Letters must read A, B, C... in order
+        failed["non_contiguous_letters"] = self._rows(option_row[letter_code != option_position], count)
+
+        # Runaway options: far longer than a typical option or past a hard cap
+        runaway = (self._modified_z(np.log1p(option_length)) > self.outlier_z) | (option_length > self.max_option_chars)
+        failed["runaway_option"] = self._rows(option_row[runaway], count)
+
+        # One regex pass over all option text, mapped back to rows by offset
+        joined = "\0".join(option_texts)
+        starts = np.cumsum(option_length + 1) - option_length - 1
+        hits = np.fromiter((match.start() for match in _HEADER_RE.finditer(joined)), dtype=np.int64)
+        failed["swallowed_header"] = self._rows(option_row[np.searchsorted(starts, hits, side="right") - 1], count)
+
+        failed["text_length_outlier"] = self._modified_z(np.log1p(text_length)) > self.outlier_z
+
+        # Exams use a fixed option count, so anything off the most common count stands out
+        if count:
+            modal_count = np.bincount(option_count).argmax()
+            failed["option_count_outlier"] = (option_count > 0) & (option_count != modal_count)
+        else:
+            failed["option_count_outlier"] = np.zeros(0, dtype=bool)
+
+        return self._report(questions, source_page, failed)
+
+    def _modified_z(self, values):
+        """Robust z-score: 0.6745 * (x - median) / MAD, zero when MAD is zero"""
+        if values.size == 0:
+            return np.zeros(0)
+        median = np.median(values)
+        mad = np.median(np.abs(values - median))
+        if mad == 0:
+            return np.zeros(values.size)
+        return 0.6745 * (values - median) / mad
+
+    @staticmethod
+    def _rows(rows, count: int):
+        """Boolean mask over questions from a list of row indexes"""
+        mask = np.zeros(count, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _report(self, questions: Sequence[Question], source_page, failed: Dict[str, Any]) -> QualityReport:
+        error_mask = np.zeros(len(questions), dtype=bool)
+        for check in ERROR_CHECKS:
+            error_mask |= failed[check]
+        warning_mask = np.zeros(len(questions), dtype=bool)
+        for check in WARNING_CHECKS:
+            warning_mask |= failed[check]
+
+        pages: Dict[int, PageQuality] = {}
+        page_values, page_index, page_counts = np.unique(source_page, return_inverse=True, return_counts=True)
+        page_errors = np.bincount(page_index, weights=error_mask, minlength=page_values.size)
+        page_warnings = np.bincount(page_index, weights=warning_mask, minlength=page_values.size)
+        for i, page in enumerate(page_values.tolist()):
+            pages[page] = PageQuality(
+                questions=int(page_counts[i]),
+                errors=int(page_errors[i]),
+                warnings=int(page_warnings[i])
+            )
+
+        failures: Dict[str, List[str]] = {}
+        for check in ERROR_CHECKS + WARNING_CHECKS:
+            rows = np.flatnonzero(failed[check])
+            if rows.size == 0:
+                continue
+            failures[check] = [questions[row].id for row in rows.tolist()]
+            rows_per_page = np.bincount(page_index[rows], minlength=page_values.size)
+            for i in np.flatnonzero(rows_per_page).tolist():
+                pages[page_values[i].item()].checks[check] = int(rows_per_page[i])
+
+        return QualityReport(total=len(questions), failures=failures, pages=pages)
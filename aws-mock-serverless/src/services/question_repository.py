@@ -0,0 +1,112 @@
+"""
+Indexed in-memory question repository
+"""
+from typing import Dict, Generic, Hashable, Iterable, Iterator, List, Optional, TypeVar
+
+from ..models.question import Question
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class _Index(Generic[K]):
+    """Maps a key to the questions carrying it, keeping insertion order and O(1) removal"""
+
+    def __init__(self):
+        self._buckets: Dict[K, Dict[str, Question]] = {}
+
+    def add(self, key: K, question: Question) -> None:
+        self._buckets.setdefault(key, {})[question.id] = question
+
+    def remove(self, key: K, question_id: str) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(question_id, None)
+        if not bucket:
+            del self._buckets[key]
+
+    def get(self, key: K) -> List[Question]:
+        return list(self._buckets.get(key, {}).values())
+
+    def keys(self) -> List[K]:
+        return list(self._buckets)
+
+
+class QuestionRepository:
+    """
+    Holds questions with hash indexes by ID, exam type, question number and source page
+
+    Lookups are O(1) by ID and O(k) in the number of matches otherwise. Indexes
+    are built from the field values at add() time, so re-add a question after
+    changing one of those fields.
+    """
+
+    def __init__(self, questions: Iterable[Question] = ()):
+        self._by_id: Dict[str, Question] = {}
+        self._by_exam_type: _Index[str] = _Index()
+        self._by_number: _Index[tuple] = _Index()
+        self._by_page: _Index[int] = _Index()
+        self.add_all(questions)
+
+    def add(self, question: Question) -> None:
+        """Add a question, replacing any existing question with the same ID"""
+        if question.id in self._by_id:
+            self.remove(question.id)
+
+        self._by_id[question.id] = question
+        self._by_exam_type.add(question.exam_type, question)
+        self._by_number.add((question.exam_type, question.question_number), question)
+        self._by_page.add(question.source_page, question)
+
+    def add_all(self, questions: Iterable[Question]) -> None:
+        """Add many questions"""
+        for question in questions:
+            self.add(question)
+
+    def remove(self, question_id: str) -> Optional[Question]:
+        """Remove a question by ID, returning it if it was present"""
+        question = self._by_id.pop(question_id, None)
+        if question is None:
+            return None
+
+        self._by_exam_type.remove(question.exam_type, question_id)
+        self._by_number.remove((question.exam_type, question.question_number), question_id)
+        self._by_page.remove(question.source_page, question_id)
+        return question
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, question_id: object) -> bool:
+        return question_id in self._by_id
+
+    def get_question_by_id(self, question_id: str) -> Optional[Question]:
+        """Find question by ID"""
+        return self._by_id.get(question_id)
+
+    def get_questions_by_exam_type(self, exam_type: str) -> List[Question]:
+        """Questions of one exam type, in insertion order"""
+        return self._by_exam_type.get(exam_type)
+
+    def get_questions_by_number(self, question_number: str, exam_type: Optional[str] = None) -> List[Question]:
+        """Questions with a question number, within one exam type or across all of them"""
+        if exam_type is not None:
+            return self._by_number.get((exam_type, question_number))
+
+        return [
+            question
+            for exam in self._by_exam_type.keys()
+            for question in self._by_number.get((exam, question_number))
+        ]
+
+    def get_questions_by_page(self, source_page: int) -> List[Question]:
+        """Questions extracted from a source page"""
+        return self._by_page.get(source_page)
+
+    def exam_types(self) -> List[str]:
+        """Exam types currently present"""
+        return self._by_exam_type.keys()
@@ -1,11 +1,44 @@
 """
 Question service for managing question data operations
 """
-from typing import List, Optional, Dict
+from typing import Any, Callable, Dict, Generator, IO, Iterable, List, Optional, Tuple
+import bz2
+import gzip
 import json
+import lzma
 from pathlib import Path
 
+from ..models.exam_index import ExamIndex
+from ..models.exam_snapshot import ExamSnapshot
 from ..models.question import Question
+from ..utils.db_utils import DynamoDBUtils
+from .quality_service import BatchValidator, QualityReport
+from .question_repository import QuestionRepository
+from .search_index import SearchIndex
+
+
+# Compression is chosen from the file extension, e.g. questions.jsonl.gz
+_OPENERS: Dict[str, Callable[..., IO]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open
+}
+
+_READ_CHUNK_SIZE = 64 * 1024
+# A decode error this close to the end of the buffer may just be a token (number,
+# literal, \uXXXX escape) cut off by the chunk boundary; further back it is malformed input
+_MAX_TOKEN_CHARS = 64
+
+
+def _open_text(path: str | Path, mode: str) -> IO:
+    """Open a text file, transparently (de)compressing by extension"""
+    opener = _OPENERS.get(Path(path).suffix, open)
+    return opener(path, f"{mode}t", encoding="utf-8")
+
+
+def _is_jsonl(path: str | Path) -> bool:
+    """JSON Lines files are recognised by a .jsonl suffix, before any compression suffix"""
+    return ".jsonl" in Path(path).suffixes
 
 
 class QuestionService:
@@ -14,51 +47,152 @@ class QuestionService:
     def __init__(self):
         pass
     
-    def save_questions_to_json(self, questions: List[Question], output_path: str) -> None:
-        """Save questions to regular JSON format"""
-        questions_dict = [q.to_dict() for q in questions]
+    def save_questions_to_json(self, questions: Iterable[Question], output_path: str) -> int:
+        """
+        Save questions to regular JSON format
+        Questions are streamed one at a time; .jsonl paths get JSON Lines, .gz/.bz2/.xz are compressed
+        """
+        return self._write_records((q.to_dict() for q in questions), output_path)
+    
+    def save_questions_to_dynamodb_format(self, questions: Iterable[Question], output_path: str) -> int:
+        """Save questions in DynamoDB-compatible format, streamed like save_questions_to_json"""
+        return self._write_records((q.to_dynamodb_item() for q in questions), output_path)
+    
+    def _write_records(self, records: Iterable[Dict[str, Any]], output_path: str) -> int:
+        """Write records as JSON Lines, or as the same indented array json.dump would produce"""
+        count = 0
+        with _open_text(output_path, "w") as f:
+            if _is_jsonl(output_path):
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+                    count += 1
+                return count
+            
+            for record in records:
+                f.write(",\n" if count else "[\n")
+                f.write("  " + json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                count += 1
+            f.write("\n]" if count else "[]")
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(questions_dict, f, indent=2, ensure_ascii=False)
+        return count
     
-    def save_questions_to_dynamodb_format(self, questions: List[Question], output_path: str) -> None:
-        """Save questions in DynamoDB-compatible format"""
-        dynamodb_items = [q.to_dynamodb_item() for q in questions]
+    def build_exam_snapshots(self, questions: List[Question]) -> Dict[str, ExamSnapshot]:
+        """Build one pre-serialized, compressed snapshot per exam type"""
+        return {
+            exam_type: ExamSnapshot.build(exam_type, exam_questions)
+            for exam_type, exam_questions in self._group_by_exam_type(questions).items()
+        }
+    
+    def build_exam_indexes(self, questions: List[Question]) -> Dict[str, Tuple[ExamIndex, List[bytes]]]:
+        """Build one packed question ID index (and its shards) per exam type"""
+        return {
+            exam_type: ExamIndex.build(exam_type, exam_questions)
+            for exam_type, exam_questions in self._group_by_exam_type(questions).items()
+        }
+    
+    def _group_by_exam_type(self, questions: Iterable[Question]) -> Dict[str, List[Question]]:
+        by_exam_type: Dict[str, List[Question]] = {}
+        for question in questions:
+            by_exam_type.setdefault(question.exam_type, []).append(question)
+        return by_exam_type
+    
+    def save_search_index(self, questions: Iterable[Question], output_path: str) -> int:
+        """Build the keyword search index artifact, returning its size in bytes"""
+        return SearchIndex.save(questions, output_path)
+    
+    def publish_exam_artifacts(self, db_utils: DynamoDBUtils, questions: List[Question],
+                               search_index_path: Optional[str] = None) -> None:
+        """
+        Publish what the read handlers serve besides the question items, then bump the data version once
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(dynamodb_items, f, indent=2, ensure_ascii=False)
+        questions must be every question of the exam types they cover: each
+        exam type's snapshot and packed ID index are rebuilt from them, and so
+        is the search index artifact when search_index_path is given.
+        """
+        # Pre-serialized exam sets for GET /questions
+        for exam_type, snapshot in self.build_exam_snapshots(questions).items():
+            if db_utils.put_exam_snapshot(snapshot.to_dynamodb_item()):
+                print(f"📦 Published {exam_type} snapshot {snapshot.etag} "
+                      f"({snapshot.count} questions, {len(snapshot.body_gzip)} bytes gzip)")
+        # Packed ID lists that the random exam endpoint samples from
+        for exam_type, (index, shards) in self.build_exam_indexes(questions).items():
+            db_utils.put_exam_index(index.to_dynamodb_item(), index.shard_items(shards))
+            print(f"🎲 Published {exam_type} exam index ({index.count} questions, "
+                  f"{len(index.topics)} topics, {index.shard_count} shards)")
+        if search_index_path:
+            index_bytes = self.save_search_index(questions, search_index_path)
+            print(f"🔎 Built search index: {search_index_path} ({index_bytes} bytes)")
+        # Handler caches drop everything on their next version poll
+        db_utils.bump_data_version()
     
     def load_questions_from_json(self, json_path: str) -> List[Question]:
         """Load questions from JSON file"""
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        questions = []
-        for item in data:
+        return list(self.iter_questions_from_json(json_path))
+    
+    def iter_questions_from_json(self, json_path: str) -> Generator[Question, None, None]:
+        """Lazily read questions from a JSON array or JSON Lines file, optionally compressed"""
+        for item in self._iter_records(json_path):
             # Convert dict back to Question object
-            options = [QuestionOption(letter=opt["letter"], text=opt["text"]) 
-                      for opt in item.get("options", [])]
-            
-            question = Question(
-                id=item["id"],
-                question_number=item["question_number"],
-                question_text=item["question_text"],
-                options=options,
-                correct_count=item["correct_count"],
-                source_page=item["source_page"],
-                correct_answer=item.get("correct_answer"),
-                exam_type=item.get("exam_type", "AWS-SAA-C03")
-            )
-            questions.append(question)
+            yield Question.from_dict(item)
+    
+    def _iter_records(self, path: str) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the objects of a JSON array or JSON Lines file without loading it whole
         
-        return questions
+        null records are skipped. A malformed record raises ValueError with its
+        character offset as soon as it is seen, without reading the rest of the file.
+        """
+        decoder = json.JSONDecoder()
+        with _open_text(path, "r") as f:
+            buffer = ""
+            pos = 0
+            consumed = 0  # characters dropped from the front of the buffer so far
+            
+            while True:
+                # Skip separators: whitespace, array brackets and commas between elements
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+                    pos += 1
+                
+                if pos < len(buffer):
+                    try:
+                        record, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError as e:
+                        # Only an unterminated string or an error at the very end can be a cut-off record
+                        if e.pos < len(buffer) - _MAX_TOKEN_CHARS and not e.msg.startswith("Unterminated string"):
+                            raise ValueError(f"Malformed record at character {consumed + e.pos} "
+                                             f"of {path}: {e.msg}") from e
+                    else:
+                        if record is not None:
+                            yield record
+                        pos = end
+                        continue
+                
+                chunk = f.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    if pos < len(buffer):
+                        try:
+                            decoder.raw_decode(buffer, pos)
+                        except json.JSONDecodeError as e:
+                            raise ValueError(f"Malformed record at character {consumed + e.pos} "
+                                             f"of {path}: {e.msg}") from e
+                    return
+                consumed += pos
+                buffer = buffer[pos:] + chunk
+                pos = 0
     
-    def get_questions_by_exam_type(self, questions: List[Question], exam_type: str) -> List[Question]:
-        """Filter questions by exam type"""
+    def get_questions_by_exam_type(self, questions: List[Question] | QuestionRepository,
+                                   exam_type: str) -> List[Question]:
+        """Filter questions by exam type; pass a QuestionRepository for indexed lookups"""
+        if isinstance(questions, QuestionRepository):
+            return questions.get_questions_by_exam_type(exam_type)
         return [q for q in questions if q.exam_type == exam_type]
     
-    def get_question_by_id(self, questions: List[Question], question_id: str) -> Optional[Question]:
-        """Find question by ID"""
+    def get_question_by_id(self, questions: List[Question] | QuestionRepository,
+                           question_id: str) -> Optional[Question]:
+        """Find question by ID; pass a QuestionRepository for indexed lookups"""
+        if isinstance(questions, QuestionRepository):
+            return questions.get_question_by_id(question_id)
         return next((q for q in questions if q.id == question_id), None)
     
     def validate_question(self, question: Question) -> Dict[str, List[str]]:
@@ -78,3 +212,7 @@ class QuestionService:
             errors.append("Question number is required")
         
         return {"errors": errors, "is_valid": len(errors) == 0}
+    
+    def validate_questions(self, questions: List[Question]) -> QualityReport:
+        """Validate a whole question set at once and report quality per source page"""
+        return BatchValidator().validate(questions)
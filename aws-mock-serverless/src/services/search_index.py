@@ -0,0 +1,236 @@
+"""
+Prebuilt inverted index over question and option text, with BM25 ranking and prefix search
+
+The ingest pipeline builds the index once and writes it as a single binary
+artifact. The search handler memory-maps it, so only the small string tables
+are decoded at load time and postings are read straight from the page cache.
+
+Artifact layout (little-endian):
+    header          magic, version, doc/term/posting counts, avgdl, string table location
+    doc_lengths     uint32[doc_count]     tokens per question
+    doc_exams       uint32[doc_count]     index into exam_types
+    term_offsets    uint32[term_count+1]  start of each term's postings
+    postings        uint32[2*posting_count] (doc, term frequency) pairs, by doc
+    strings         UTF-8 JSON: sorted terms, doc IDs, question numbers, exam types
+"""
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.question import Question
+
+
+MAGIC = b"QSX1"
+FORMAT_VERSION = 1
+
+# magic, version, doc_count, term_count, posting_count, reserved, avgdl, strings_offset, strings_length
+_HEADER = struct.Struct("<4sIIIIIdQQ")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# array/memoryview typecode of a native 4-byte unsigned int ("I" is only guaranteed to be >= 2 bytes)
+_UINT32 = next(code for code in ("I", "L") if array(code).itemsize == 4)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens, e.g. 'S3 Glacier' -> ['s3', 'glacier']"""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result"""
+    question_id: str
+    question_number: str
+    exam_type: str
+    score: float
+
+
+class SearchIndex:
+    """Read-only BM25 index over a question bank"""
+
+    def __init__(self, buffer, k1: float = 1.2, b: float = 0.75):
+        self._buffer = buffer
+        self.k1 = k1
+        self.b = b
+
+        magic, version, doc_count, term_count, posting_count, _, avgdl, strings_offset, strings_length = \
+            _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a question search index or unsupported version")
+
+        self.doc_count = doc_count
+        self.avgdl = avgdl
+
+        strings = json.loads(bytes(buffer[strings_offset:strings_offset + strings_length]).decode("utf-8"))
+        self.terms: List[str] = strings["terms"]
+        self.doc_ids: List[str] = strings["doc_ids"]
+        self.doc_numbers: List[str] = strings["doc_numbers"]
+        self.exam_types: List[str] = strings["exam_types"]
+        self._term_ids = {term: i for i, term in enumerate(self.terms)}
+
+        words = _uint32_view(buffer, _HEADER.size, 2 * doc_count + term_count + 1 + 2 * posting_count)
+        self._doc_lengths = words[:doc_count]
+        self._doc_exams = words[doc_count:2 * doc_count]
+        self._term_offsets = words[2 * doc_count:2 * doc_count + term_count + 1]
+        self._postings = words[2 * doc_count + term_count + 1:]
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'SearchIndex':
+        """Memory-map an index file"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, **kwargs)
+
+    @staticmethod
+    def build(questions: Iterable[Question]) -> bytes:
+        """Serialize an index over question text and option text"""
+        doc_ids: List[str] = []
+        doc_numbers: List[str] = []
+        doc_lengths = array(_UINT32)
+        doc_exams = array(_UINT32)
+        exam_index: Dict[str, int] = {}
+        term_docs: Dict[str, List[Tuple[int, int]]] = {}
+
+        for question in questions:
+            doc = len(doc_ids)
+            doc_ids.append(question.id)
+            doc_numbers.append(question.question_number)
+            doc_exams.append(exam_index.setdefault(question.exam_type, len(exam_index)))
+
+            counts: Dict[str, int] = {}
+            length = 0
+            for text in [question.question_text] + [opt.text for opt in question.options]:
+                for token in tokenize(text):
+                    counts[token] = counts.get(token, 0) + 1
+                    length += 1
+            doc_lengths.append(length)
+
+            for term, tf in counts.items():
+                term_docs.setdefault(term, []).append((doc, tf))
+
+        terms = sorted(term_docs)
+        term_offsets = array(_UINT32, [0])
+        postings = array(_UINT32)
+        for term in terms:
+            for doc, tf in term_docs[term]:
+                postings.append(doc)
+                postings.append(tf)
+            term_offsets.append(len(postings) // 2)
+
+        strings = json.dumps({
+            "terms": terms,
+            "doc_ids": doc_ids,
+            "doc_numbers": doc_numbers,
+            "exam_types": list(exam_index)
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        words = doc_lengths + doc_exams + term_offsets + postings
+        if sys.byteorder != "little":
+            words.byteswap()
+
+        strings_offset = _HEADER.size + len(words) * words.itemsize
+        header = _HEADER.pack(
+            MAGIC, FORMAT_VERSION, len(doc_ids), len(terms), len(postings) // 2, 0,
+            sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0,
+            strings_offset, len(strings)
+        )
+        return header + words.tobytes() + strings
+
+    @staticmethod
+    def save(questions: Iterable[Question], output_path: str) -> int:
+        """Build an index and write it atomically, returning its size in bytes"""
+        data = SearchIndex.build(questions)
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, output_path)
+        return len(data)
+
+    def expand_prefix(self, prefix: str, max_expansions: int = 50) -> List[str]:
+        """Indexed terms starting with prefix, in lexical order"""
+        expansions = []
+        for term in self.terms[bisect_left(self.terms, prefix):]:
+            if not term.startswith(prefix) or len(expansions) >= max_expansions:
+                break
+            expansions.append(term)
+        return expansions
+
+    def search(self, query: str, limit: int = 10, exam_type: Optional[str] = None,
+               prefix: bool = False, max_expansions: int = 50) -> List[SearchHit]:
+        """
+        Rank questions against a keyword query with BM25
+
+        Terms ending in '*' match every indexed term with that prefix; with
+        prefix=True the last query term does too (search-as-you-type).
+        """
+        raw_terms = query.split()
+        query_terms: List[List[str]] = []
+        for position, raw in enumerate(raw_terms):
+            is_prefix = raw.endswith("*") or (prefix and position == len(raw_terms) - 1)
+            tokens = tokenize(raw)
+            for i, token in enumerate(tokens):
+                if is_prefix and i == len(tokens) - 1:
+                    query_terms.append(self.expand_prefix(token, max_expansions))
+                elif token in self._term_ids:
+                    query_terms.append([token])
+
+        exam_filter = None
+        if exam_type is not None:
+            if exam_type not in self.exam_types:
+                return []
+            exam_filter = self.exam_types.index(exam_type)
+
+        scores: Dict[int, float] = {}
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1.0
+        doc_lengths, doc_exams, postings = self._doc_lengths, self._doc_exams, self._postings
+        for alternatives in query_terms:
+            # A prefix counts once per document, using its best-scoring expansion
+            term_scores: Dict[int, float] = {}
+            for term in alternatives:
+                term_id = self._term_ids[term]
+                start, end = self._term_offsets[term_id], self._term_offsets[term_id + 1]
+                df = end - start
+                idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+                for i in range(2 * start, 2 * end, 2):
+                    doc = postings[i]
+                    if exam_filter is not None and doc_exams[doc] != exam_filter:
+                        continue
+                    tf = postings[i + 1]
+                    score = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_lengths[doc] / avgdl))
+                    if score > term_scores.get(doc, 0.0):
+                        term_scores[doc] = score
+            for doc, score in term_scores.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda entry: (entry[1], -entry[0]))
+        return [
+            SearchHit(
+                question_id=self.doc_ids[doc],
+                question_number=self.doc_numbers[doc],
+                exam_type=self.exam_types[doc_exams[doc]],
+                score=round(score, 4)
+            )
+            for doc, score in top
+        ]
+
+
+def _uint32_view(buffer, offset: int, count: int):
+    """Zero-copy uint32 view of the little-endian words section"""
+    data = memoryview(buffer)[offset:offset + 4 * count]
+    if sys.byteorder == "little":
+        return data.cast(_UINT32)
+
+    words = array(_UINT32)
+    words.frombytes(data)
+    words.byteswap()
+    return words
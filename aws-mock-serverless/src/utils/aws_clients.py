@@ -0,0 +1,49 @@
+"""
+Shared AWS client layer reused across warm Lambda invocations
+
+Clients are created once per container and cached at module level so that
+session setup, endpoint resolution and the TLS handshake are only paid on
+cold start. Connection settings can be tuned through environment variables.
+"""
+import os
+from typing import Any, Optional
+
+import boto3
+from botocore.config import Config
+
+from .metrics import instrument_dynamodb_client
+
+
+# Table name is resolved once when the container initialises
+TABLE_NAME = os.environ.get('QUESTIONS_TABLE_NAME', 'aws-mock-questions')
+
+DYNAMODB_CLIENT_CONFIG = Config(
+    # Keep idle connections open between invocations instead of re-handshaking
+    tcp_keepalive=True,
+    max_pool_connections=int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', 10)),
+    connect_timeout=float(os.environ.get('DYNAMODB_CONNECT_TIMEOUT', 2)),
+    read_timeout=float(os.environ.get('DYNAMODB_READ_TIMEOUT', 5)),
+    retries={
+        'max_attempts': int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', 3)),
+        'mode': 'standard'
+    }
+)
+
+_dynamodb_client: Optional[Any] = None
+
+
+def get_dynamodb_client() -> Any:
+    """Return the process-wide DynamoDB client, creating it on first use"""
+    global _dynamodb_client
+
+    if _dynamodb_client is None:
+        # Call latency and consumed capacity are recorded when METRICS_ENABLED is set
+        _dynamodb_client = instrument_dynamodb_client(boto3.client('dynamodb', config=DYNAMODB_CLIENT_CONFIG))
+
+    return _dynamodb_client
+
+
+def reset_clients() -> None:
+    """Drop cached clients so the next call builds fresh ones (cold start)"""
+    global _dynamodb_client
+    _dynamodb_client = None
@@ -0,0 +1,177 @@
+"""
+Concurrent DynamoDB bulk loader with retry, backoff and adaptive concurrency
+"""
+import random
+import time
+from collections import deque
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from .aws_clients import TABLE_NAME, get_dynamodb_client
+
+
+# DynamoDB batch_write_item accepts at most 25 requests per call
+MAX_BATCH_SIZE = 25
+
+THROTTLING_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+}
+
+
+@dataclass
+class LoadStats:
+    """Progress and throughput of a bulk load"""
+    total: int
+    written: int = 0
+    batches: int = 0
+    retried_items: int = 0
+    throttle_events: int = 0
+    concurrency: int = 0
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def items_per_second(self) -> float:
+        return self.written / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def print_progress(stats: LoadStats) -> None:
+    """Default progress reporter"""
+    print(f"   ⬆️  {stats.written}/{stats.total} items  {stats.items_per_second:,.0f} items/s  "
+          f"concurrency={stats.concurrency}  retried={stats.retried_items}  throttled={stats.throttle_events}")
+
+
+class BulkLoader:
+    """
+    Writes Put/Delete requests with several batch_write_item calls in flight.
+
+    Unprocessed items are requeued with full-jitter exponential backoff. Every
+    throttled batch halves the number of concurrent writers and every clean
+    batch adds one back (AIMD), so the loader settles just below the table's
+    write capacity instead of hammering it.
+    """
+
+    def __init__(self, table_name: Optional[str] = None, dynamodb: Any = None,
+                 max_workers: int = 8, min_workers: int = 1, batch_size: int = MAX_BATCH_SIZE,
+                 max_retries: int = 8, base_delay: float = 0.05, max_delay: float = 5.0,
+                 progress: Optional[Callable[[LoadStats], None]] = print_progress,
+                 progress_interval: float = 2.0):
+        self.table_name = table_name or TABLE_NAME
+        self.dynamodb = dynamodb or get_dynamodb_client()
+        self.max_workers = max_workers
+        self.min_workers = min_workers
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self._random = random.Random()
+
+    def put_items(self, items: List[Dict[str, Any]]) -> LoadStats:
+        """Put every item, raising if any could not be written"""
+        return self.write([{'PutRequest': {'Item': item}} for item in items])
+
+    def write(self, write_requests: List[Dict[str, Any]]) -> LoadStats:
+        """Send write requests until all succeed or exhaust their retries"""
+        stats = LoadStats(total=len(write_requests), concurrency=self.max_workers)
+
+        # Each queued entry is (not_before, attempt, batch)
+        queue: Deque[Tuple[float, int, List[Dict[str, Any]]]] = deque(
+            (0.0, 0, write_requests[i:i + self.batch_size])
+            for i in range(0, len(write_requests), self.batch_size)
+        )
+        in_flight: Dict[Future, Tuple[int, List[Dict[str, Any]]]] = {}
+        last_report = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while queue or in_flight:
+                now = time.perf_counter()
+
+                # Submit ready batches up to the current concurrency limit
+                for _ in range(len(queue)):
+                    if len(in_flight) >= stats.concurrency:
+                        break
+                    not_before, attempt, batch = queue.popleft()
+                    if not_before > now:
+                        queue.append((not_before, attempt, batch))
+                        continue
+                    # Run in a copy of the caller's context so call metrics reach its recorder
+                    future = pool.submit(contextvars.copy_context().run, self._write_batch, batch)
+                    in_flight[future] = (attempt, batch)
+
+                # At the concurrency limit only a completion can free a slot, so block on it.
+                # Below it, every queued batch is backing off: wake when the first becomes due.
+                timeout = None
+                if queue and len(in_flight) < stats.concurrency:
+                    timeout = max(0.0, min(entry[0] for entry in queue) - time.perf_counter())
+                if not in_flight:
+                    time.sleep(timeout or 0)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt, batch = in_flight.pop(future)
+                    unprocessed, throttled = future.result()
+                    stats.batches += 1
+                    stats.written += len(batch) - len(unprocessed)
+
+                    if throttled:
+                        stats.throttle_events += 1
+                        stats.concurrency = max(self.min_workers, stats.concurrency // 2)
+                    elif not unprocessed:
+                        stats.concurrency = min(self.max_workers, stats.concurrency + 1)
+
+                    if unprocessed:
+                        self._requeue(queue, stats, attempt + 1, unprocessed)
+
+                if self.progress and time.perf_counter() - last_report >= self.progress_interval:
+                    self.progress(stats)
+                    last_report = time.perf_counter()
+
+        stats.finished_at = time.perf_counter()
+        if self.progress:
+            self.progress(stats)
+
+        if stats.failed:
+            raise RuntimeError(f"{len(stats.failed)} of {stats.total} items could not be written "
+                               f"after {self.max_retries} retries")
+
+        return stats
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Send one batch; returns (unprocessed requests, whether DynamoDB throttled)"""
+        try:
+            response = self.dynamodb.batch_write_item(RequestItems={self.table_name: batch})
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+                return batch, True
+            raise
+
+        unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+        # Partially processed batches mean the table is at capacity
+        return unprocessed, bool(unprocessed)
+
+    def _requeue(self, queue: Deque, stats: LoadStats, attempt: int,
+                 unprocessed: List[Dict[str, Any]]) -> None:
+        """Schedule unprocessed requests again after a jittered exponential delay"""
+        if attempt > self.max_retries:
+            stats.failed.extend(unprocessed)
+            return
+
+        stats.retried_items += len(unprocessed)
+        delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        not_before = time.perf_counter() + delay
+        for i in range(0, len(unprocessed), self.batch_size):
+            queue.append((not_before, attempt, unprocessed[i:i + self.batch_size]))
@@ -1,43 +1,241 @@
 """
 Database utility functions for DynamoDB operations
 """
-import boto3
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import contextvars
+from typing import List, Dict, Any, Iterator, Optional
+import gzip
 import json
+import queue
+import random
+import threading
+import time
+
+from ..models.exam_index import ExamIndex
+from .aws_clients import TABLE_NAME, get_dynamodb_client
+from .bulk_loader import BulkLoader, LoadStats
+from .metrics import timed_stage
+
+
+# Item whose counter the ingest bumps after every write, used to invalidate read caches
+DATA_VERSION_KEY = {'PK': {'S': 'META#DATA_VERSION'}}
+
+# DynamoDB items are capped at 400KB; leave room for the non-body attributes
+MAX_SNAPSHOT_BYTES = 390 * 1024
+
+
+def _encode_binary(value: Any) -> str:
+    """json.dumps hook writing binary attributes as base64, as DynamoDB JSON does"""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_binary(attribute: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn the base64 B/BS values of an exported attribute back into bytes"""
+    (kind, value), = attribute.items()
+    if kind == 'B':
+        return {'B': base64.b64decode(value)}
+    if kind == 'BS':
+        return {'BS': [base64.b64decode(v) for v in value]}
+    if kind == 'M':
+        return {'M': {k: _decode_binary(v) for k, v in value.items()}}
+    if kind == 'L':
+        return {'L': [_decode_binary(v) for v in value]}
+    return attribute
+
+
+def read_exported_items(input_path: str) -> Iterator[Dict[str, Any]]:
+    """Items of a file written by export_table_to_json, ready for put_item"""
+    opener = gzip.open if input_path.endswith('.gz') else open
+    with opener(input_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield {name: _decode_binary(attribute) for name, attribute in json.loads(line).items()}
+
+
+def get_data_version(dynamodb: Any, table_name: str) -> Optional[str]:
+    """Read the current data version stamp, or None if nothing was ingested yet"""
+    response = dynamodb.get_item(TableName=table_name, Key=DATA_VERSION_KEY,
+                                 ProjectionExpression='data_version')
+    item = response.get('Item')
+    return item['data_version']['N'] if item else None
+
+
+def batch_get_items(dynamodb: Any, table_name: str, keys: List[Dict[str, Any]],
+                    max_retries: int = 5, base_delay: float = 0.05) -> List[Dict[str, Any]]:
+    """
+    Fetch items with BatchGetItem in 100-key chunks
+    UnprocessedKeys are retried with jittered exponential backoff; missing keys are simply absent
+    """
+    items = []
+    for i in range(0, len(keys), 100):
+        request = {table_name: {'Keys': keys[i:i + 100]}}
+        
+        for attempt in range(max_retries + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            
+            request = response.get('UnprocessedKeys')
+            if not request:
+                break
+            if attempt == max_retries:
+                # No backoff after the last attempt, nothing follows it
+                raise RuntimeError(f"{len(request[table_name]['Keys'])} keys still unprocessed "
+                                   f"after {max_retries} retries")
+            time.sleep(random.uniform(0, base_delay * 2 ** attempt))
+    
+    return items
 
 
 class DynamoDBUtils:
     """Utility class for DynamoDB operations"""
     
-    def __init__(self, table_name: str):
-        self.dynamodb = boto3.client('dynamodb')
-        self.table_name = table_name
+    def __init__(self, table_name: Optional[str] = None):
+        self.dynamodb = get_dynamodb_client()
+        self.table_name = table_name or TABLE_NAME
     
-    def batch_write_items(self, items: List[Dict[str, Any]], batch_size: int = 25) -> None:
+    @timed_stage('batch_write_items')
+    def batch_write_items(self, items: List[Dict[str, Any]], batch_size: int = 25) -> LoadStats:
         """
         Write items to DynamoDB in batches
         DynamoDB batch_write_item has a limit of 25 items per request
         """
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            
-            request_items = {
-                self.table_name: [
-                    {'PutRequest': {'Item': item}}
-                    for item in batch
-                ]
-            }
-            
-            try:
-                response = self.dynamodb.batch_write_item(RequestItems=request_items)
-                
-                # Handle unprocessed items (retry logic would go here)
-                if response.get('UnprocessedItems'):
-                    print(f"Warning: {len(response['UnprocessedItems'])} items were not processed")
-                    
-            except Exception as e:
-                print(f"Error writing batch {i//batch_size + 1}: {e}")
-                raise
+        return self._batch_write_requests([{'PutRequest': {'Item': item}} for item in items], batch_size)
+    
+    def _batch_write_requests(self, write_requests: List[Dict[str, Any]], batch_size: int = 25) -> LoadStats:
+        """Send Put/Delete write requests through the concurrent bulk loader"""
+        loader = BulkLoader(self.table_name, dynamodb=self.dynamodb, batch_size=batch_size)
+        return loader.write(write_requests)
+    
+    @timed_stage('query_exam_items')
+    def query_exam_items(self, exam_type: str) -> List[Dict[str, Any]]:
+        """Fetch every item of an exam type through GSI1"""
+        paginator = self.dynamodb.get_paginator('query')
+        
+        items = []
+        for page in paginator.paginate(
+            TableName=self.table_name,
+            IndexName='GSI1',
+            KeyConditionExpression='GSI1PK = :exam_type',
+            ExpressionAttributeValues={':exam_type': {'S': f'EXAM#{exam_type}'}}
+        ):
+            items.extend(page['Items'])
+        
+        return items
+    
+    @timed_stage('sync_items')
+    def sync_items(self, items: List[Dict[str, Any]], dry_run: bool = False,
+                   bump_version: bool = True) -> Dict[str, int]:
+        """
+        Make the table match items for every exam type they cover, writing only the difference
+        
+        New or changed items are put and items that disappeared from the extracted
+        set are deleted; identical items are left untouched. Relies on stable
+        question IDs so unchanged questions keep their PK across extractions.
+        
+        Items sharing a PK (same exam type, number and text) are written once if
+        identical; if they differ, one would silently overwrite the other, so a
+        ValueError is raised instead.
+        
+        Pass bump_version=False when more artifacts follow, so caches are
+        invalidated once, after the last of them is written.
+        """
+        desired = {}
+        conflicts = []
+        for item in items:
+            pk = item['PK']['S']
+            previous = desired.setdefault(pk, item)
+            if previous is item:
+                continue
+            if previous == item:
+                print(f"⚠️  Skipping identical duplicate of {pk}")
+            else:
+                conflicts.append(f"{pk} (pages {previous['source_page']['N']} and {item['source_page']['N']})")
+        if conflicts:
+            raise ValueError(f"{len(conflicts)} question ID collision(s) between different questions: "
+                             f"{', '.join(conflicts)}")
+        exam_types = {item['exam_type']['S'] for item in items}
+        
+        existing = {}
+        for exam_type in exam_types:
+            for item in self.query_exam_items(exam_type):
+                existing[item['PK']['S']] = item
+        
+        write_requests = []
+        stats = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        
+        for pk, item in desired.items():
+            current = existing.get(pk)
+            if current == item:
+                stats['unchanged'] += 1
+                continue
+            stats['inserted' if current is None else 'updated'] += 1
+            write_requests.append({'PutRequest': {'Item': item}})
+        
+        for pk in existing.keys() - desired.keys():
+            stats['deleted'] += 1
+            write_requests.append({'DeleteRequest': {'Key': {'PK': {'S': pk}}}})
+        
+        if not dry_run and write_requests:
+            self._batch_write_requests(write_requests)
+            if bump_version:
+                self.bump_data_version()
+        
+        return stats
+    
+    @timed_stage('put_exam_snapshot')
+    def put_exam_snapshot(self, snapshot_item: Dict[str, Any]) -> bool:
+        """
+        Store a serialized exam snapshot item; returns whether it was stored
+        
+        A snapshot over the DynamoDB item limit is not written, and the one
+        published earlier is deleted so GET /questions falls back to the
+        paginated query instead of serving stale questions.
+        """
+        size = sum(len(value.get('B', b'')) for value in snapshot_item.values())
+        if size > MAX_SNAPSHOT_BYTES:
+            self.dynamodb.delete_item(TableName=self.table_name, Key={'PK': snapshot_item['PK']})
+            print(f"⚠️  Snapshot {snapshot_item['PK']['S']} is {size} bytes compressed, over the "
+                  f"{MAX_SNAPSHOT_BYTES} byte item budget; removed it, GET /questions will query instead")
+            return False
+        
+        self.dynamodb.put_item(TableName=self.table_name, Item=snapshot_item)
+        return True
+    
+    @timed_stage('put_exam_index')
+    def put_exam_index(self, index_item: Dict[str, Any], shard_items: List[Dict[str, Any]]) -> None:
+        """
+        Store a packed exam ID index, shards first so readers never see metadata without them
+        
+        The new shards sit under their own versioned keys, so putting the
+        metadata item is the switch-over; shards of the index it replaces are
+        deleted afterwards.
+        """
+        response = self.dynamodb.get_item(TableName=self.table_name, Key={'PK': index_item['PK']})
+        previous = ExamIndex.from_dynamodb_item(response['Item']) if 'Item' in response else None
+        
+        if shard_items:
+            self._batch_write_requests([{'PutRequest': {'Item': item}} for item in shard_items])
+        self.dynamodb.put_item(TableName=self.table_name, Item=index_item)
+        
+        if previous is not None:
+            current = {item['PK']['S'] for item in shard_items}
+            stale = [key for key in map(previous.shard_key, range(previous.shard_count)) if key not in current]
+            if stale:
+                self._batch_write_requests([{'DeleteRequest': {'Key': {'PK': {'S': key}}}} for key in stale])
+    
+    def bump_data_version(self) -> str:
+        """Increment the data version stamp so handler caches drop stale entries"""
+        response = self.dynamodb.update_item(
+            TableName=self.table_name,
+            Key=DATA_VERSION_KEY,
+            UpdateExpression='ADD data_version :one',
+            ExpressionAttributeValues={':one': {'N': '1'}},
+            ReturnValues='UPDATED_NEW'
+        )
+        return response['Attributes']['data_version']['N']
     
     def create_table_if_not_exists(self, table_schema: Dict[str, Any]) -> bool:
         """Create DynamoDB table if it doesn't exist"""
@@ -51,18 +249,70 @@ class DynamoDBUtils:
             print(f"Created table {self.table_name}")
             return True
     
-    def export_table_to_json(self, output_path: str) -> None:
-        """Export entire table to JSON file"""
-        paginator = self.dynamodb.get_paginator('scan')
+    @timed_stage('export_table_to_json')
+    def export_table_to_json(self, output_path: str, total_segments: int = 4,
+                             compress: Optional[bool] = None) -> int:
+        """
+        Export entire table to a JSON Lines file, one DynamoDB item per line
+        
+        Segments are scanned in parallel and each page is written as soon as it
+        arrives, so memory stays flat regardless of table size. The file is
+        gzip-compressed when compress is set or output_path ends in .gz. Binary
+        attributes are written base64-encoded; read_exported_items decodes them.
+        """
+        if compress is None:
+            compress = output_path.endswith('.gz')
+        
+        # Bounded hand-off between scanner threads and the writer
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+        stop = threading.Event()
         
-        all_items = []
-        for page in paginator.paginate(TableName=self.table_name):
-            all_items.extend(page['Items'])
+        def put(value: Optional[List[Dict[str, Any]]]) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(all_items, f, indent=2, ensure_ascii=False)
+        def scan_segment(segment: int) -> None:
+            try:
+                paginator = self.dynamodb.get_paginator('scan')
+                for page in paginator.paginate(TableName=self.table_name,
+                                               Segment=segment, TotalSegments=total_segments):
+                    if stop.is_set():
+                        return
+                    put(page['Items'])
+            finally:
+                put(None)
         
-        print(f"Exported {len(all_items)} items to {output_path}")
+        exported = 0
+        opener = gzip.open if compress else open
+        with ThreadPoolExecutor(max_workers=total_segments) as pool:
+            # Each segment runs in a copy of the caller's context so call metrics reach its recorder
+            futures = [pool.submit(contextvars.copy_context().run, scan_segment, segment)
+                       for segment in range(total_segments)]
+            try:
+                with opener(output_path, 'wt', encoding='utf-8') as f:
+                    finished = 0
+                    while finished < total_segments:
+                        items = pages.get()
+                        if items is None:
+                            finished += 1
+                            continue
+                        for item in items:
+                            f.write(json.dumps(item, ensure_ascii=False, default=_encode_binary))
+                            f.write('\n')
+                        exported += len(items)
+            finally:
+                stop.set()
+            
+            # Surface any scan error
+            for future in futures:
+                future.result()
+        
+        print(f"Exported {exported} items to {output_path}")
+        return exported
 
 
 def build_response(status_code: int, body: Dict[str, Any], 
@@ -83,3 +333,27 @@ def build_response(status_code: int, body: Dict[str, Any],
         'headers': default_headers,
         'body': json.dumps(body)
     }
+
+
+def questions_table_schema(table_name: str) -> Dict[str, Any]:
+    """Build the create_table schema for the questions table and its GSI1 index"""
+    return {
+        'TableName': table_name,
+        'KeySchema': [{'AttributeName': 'PK', 'KeyType': 'HASH'}],
+        'AttributeDefinitions': [
+            {'AttributeName': 'PK', 'AttributeType': 'S'},
+            {'AttributeName': 'GSI1PK', 'AttributeType': 'S'},
+            {'AttributeName': 'GSI1SK', 'AttributeType': 'S'}
+        ],
+        'GlobalSecondaryIndexes': [
+            {
+                'IndexName': 'GSI1',
+                'KeySchema': [
+                    {'AttributeName': 'GSI1PK', 'KeyType': 'HASH'},
+                    {'AttributeName': 'GSI1SK', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }
+        ],
+        'BillingMode': 'PAY_PER_REQUEST'
+    }
@@ -0,0 +1,246 @@
+"""
+Structured latency and cost instrumentation, emitted as CloudWatch EMF log lines
+
+Off unless METRICS_ENABLED is set. When off, the decorators hand back the
+wrapped function untouched, stage() returns a shared no-op context manager and
+the DynamoDB client is not hooked, so instrumented code pays next to nothing.
+
+When on, each Lambda invocation collects its stage timings, DynamoDB call
+latency, consumed capacity (ReturnConsumedCapacity is added to every call),
+item and byte counts and the cold-start flag, and prints them as one Embedded
+Metric Format JSON line, which CloudWatch turns into metrics. Code running
+outside a handler or recording() block (main.py, ingest.py) records into a
+process-wide recorder flushed with emit_process_metrics(). Code that hands
+DynamoDB calls to worker threads runs them with contextvars.copy_context() so
+they are counted against the caller's recorder.
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, Optional
+
+ENABLED = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'AwsMockTest')
+
+# DynamoDB operations that accept ReturnConsumedCapacity
+_CAPACITY_OPERATIONS = {
+    'GetItem', 'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan',
+    'BatchGetItem', 'BatchWriteItem', 'TransactGetItems', 'TransactWriteItems'
+}
+
+_NOOP = nullcontext()
+
+
+class MetricsRecorder:
+    """Accumulates metrics and properties for one invocation or process"""
+
+    def __init__(self, **dimensions: str):
+        self.dimensions = dimensions
+        self.metrics: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+        self.properties: Dict[str, Any] = {}
+        # DynamoDB hooks may fire from BulkLoader worker threads
+        self._lock = threading.Lock()
+
+    def add(self, name: str, value: float, unit: str = 'Count') -> None:
+        """Add to a metric, creating it at zero"""
+        with self._lock:
+            self.metrics[name] = self.metrics.get(name, 0) + value
+            self.units[name] = unit
+
+    def set_property(self, name: str, value: Any) -> None:
+        """Attach a searchable, non-metric field to the log line"""
+        self.properties[name] = value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block into <name>_ms; repeated stages add up"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(f'{name}_ms', (time.perf_counter() - start) * 1000, 'Milliseconds')
+
+    def to_emf(self) -> Dict[str, Any]:
+        """Render as an Embedded Metric Format document"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            units = dict(self.units)
+
+        document = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': NAMESPACE,
+                    'Dimensions': [list(self.dimensions)],
+                    'Metrics': [{'Name': name, 'Unit': units[name]} for name in metrics]
+                }]
+            }
+        }
+        document.update(self.dimensions)
+        document.update(self.properties)
+        document.update({name: round(value, 3) for name, value in metrics.items()})
+        return document
+
+    def emit(self) -> None:
+        """Print the EMF line to stdout, where Lambda ships it to CloudWatch Logs"""
+        print(json.dumps(self.to_emf(), default=str), file=sys.stdout, flush=True)
+
+
+_current: contextvars.ContextVar[Optional[MetricsRecorder]] = contextvars.ContextVar('metrics_recorder', default=None)
+# Its Service dimension is set by emit_process_metrics()
+_process_recorder = MetricsRecorder()
+_cold_start = True
+
+
+def current() -> MetricsRecorder:
+    """The recorder of the running handler invocation, else the process-wide one"""
+    return _current.get() or _process_recorder
+
+
+def stage(name: str):
+    """Context manager timing a block into the current recorder (no-op when disabled)"""
+    if not ENABLED:
+        return _NOOP
+    return current().stage(name)
+
+
+def count(name: str, value: float = 1, unit: str = 'Count') -> None:
+    """Add to a metric of the current recorder (no-op when disabled)"""
+    if ENABLED:
+        current().add(name, value, unit)
+
+
+@contextmanager
+def recording(dimensions: Dict[str, str], **properties: Any) -> Iterator[None]:
+    """Collect what the block records into a fresh recorder and emit it at the end (no-op when disabled)"""
+    if not ENABLED:
+        yield
+        return
+
+    recorder = MetricsRecorder(**dimensions)
+    for name, value in properties.items():
+        recorder.set_property(name, value)
+    token = _current.set(recorder)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        recorder.emit()
+
+
+def timed_stage(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function as a stage; returns the function unchanged when disabled"""
+    def decorate(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with current().stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_handler(name: str) -> Callable[[Callable], Callable]:
+    """Decorator for lambda_handler: one EMF line per invocation; returns the handler unchanged when disabled"""
+    def decorate(handler: Callable) -> Callable:
+        if not ENABLED:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            global _cold_start
+            recorder = MetricsRecorder(Handler=name)
+            recorder.add('cold_start', 1 if _cold_start else 0)
+            _cold_start = False
+            # Zero rather than absent on cache hits, so percentiles cover every invocation
+            recorder.add('ddb_calls', 0)
+            recorder.add('ddb_capacity_units', 0)
+            if context is not None and hasattr(context, 'aws_request_id'):
+                recorder.set_property('request_id', context.aws_request_id)
+
+            token = _current.set(recorder)
+            start = time.perf_counter()
+            try:
+                response = handler(event, context)
+            finally:
+                recorder.add('duration_ms', (time.perf_counter() - start) * 1000, 'Milliseconds')
+                _current.reset(token)
+
+            status_code = response.get('statusCode', 0)
+            body = response.get('body') or ''
+            recorder.set_property('status_code', status_code)
+            recorder.add('errors', 1 if status_code >= 500 else 0)
+            recorder.add('response_bytes', len(body), 'Bytes')
+            if status_code >= 500:
+                # Handlers turn exceptions into a 500 body; keep the message searchable
+                try:
+                    recorder.set_property('error', json.loads(body).get('message'))
+                except (TypeError, ValueError):
+                    pass
+
+            recorder.emit()
+            return response
+        return wrapper
+    return decorate
+
+
+def _add_return_capacity(params: Dict[str, Any], model: Any, **kwargs) -> None:
+    if model.name in _CAPACITY_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _start_call_timer(context: Dict[str, Any], **kwargs) -> None:
+    context['metrics_started_at'] = time.perf_counter()
+
+
+def _record_call(http_response: Any, parsed: Dict[str, Any], model: Any, context: Dict[str, Any], **kwargs) -> None:
+    recorder = current()
+    started_at = context.get('metrics_started_at')
+    if started_at is not None:
+        recorder.add(f'ddb_{model.name}_ms', (time.perf_counter() - started_at) * 1000, 'Milliseconds')
+    recorder.add('ddb_calls', 1)
+    recorder.add('ddb_response_bytes', len(getattr(http_response, 'content', b'') or b''), 'Bytes')
+
+    consumed = parsed.get('ConsumedCapacity')
+    for capacity in consumed if isinstance(consumed, list) else [consumed] if consumed else []:
+        recorder.add('ddb_capacity_units', capacity.get('CapacityUnits', 0))
+        if 'ReadCapacityUnits' in capacity:
+            recorder.add('ddb_read_units', capacity['ReadCapacityUnits'])
+        if 'WriteCapacityUnits' in capacity:
+            recorder.add('ddb_write_units', capacity['WriteCapacityUnits'])
+
+    if 'Items' in parsed:
+        recorder.add('ddb_items', len(parsed['Items']))
+    elif 'Item' in parsed:
+        recorder.add('ddb_items', 1)
+    elif 'Responses' in parsed:
+        recorder.add('ddb_items', sum(len(items) for items in parsed['Responses'].values()))
+
+
+def instrument_dynamodb_client(client: Any) -> Any:
+    """Hook a boto3 DynamoDB client to record per-call latency, capacity and sizes (no-op when disabled)"""
+    if ENABLED:
+        events = client.meta.events
+        events.register('provide-client-params.dynamodb.*', _add_return_capacity)
+        events.register('before-call.dynamodb.*', _start_call_timer)
+        events.register('after-call.dynamodb.*', _record_call)
+    return client
+
+
+def emit_process_metrics(service: str, **properties: Any) -> None:
+    """Emit and reset the process-wide recorder as Service=service, tagged with properties (scripts call this when done)"""
+    global _process_recorder
+    if ENABLED and _process_recorder.metrics:
+        recorder, _process_recorder = _process_recorder, MetricsRecorder()
+        recorder.dimensions = {'Service': service}
+        for name, value in properties.items():
+            recorder.set_property(name, value)
+        recorder.emit()
@@ -0,0 +1,80 @@
+"""
+Opaque, signed continuation tokens for paginated DynamoDB queries
+
+A token wraps a Query's LastEvaluatedKey together with the scope it was
+issued for (e.g. the exam type) and is HMAC-signed so clients cannot forge
+or tamper with start keys.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+# A default key would let anyone forge start keys, so a missing secret is a configuration
+# error raised when the handler container initialises, not on the first multi-page request.
+# PAGINATION_ALLOW_DEV_SECRET=1 opts into a fixed key for local development only.
+_DEV_TOKEN_SECRET = 'aws-mock-dev-secret'
+_ALLOW_DEV_SECRET = os.environ.get('PAGINATION_ALLOW_DEV_SECRET', '').lower() in ('1', 'true', 'yes')
+_configured_secret = os.environ.get('PAGINATION_TOKEN_SECRET') or (_DEV_TOKEN_SECRET if _ALLOW_DEV_SECRET else None)
+if not _configured_secret:
+    raise RuntimeError("PAGINATION_TOKEN_SECRET must be set for GET /questions page tokens "
+                       "(or PAGINATION_ALLOW_DEV_SECRET=1 for local development)")
+PAGINATION_TOKEN_SECRET = _configured_secret.encode('utf-8')
+
+# Server-side bounds for page size and per-response payload
+DEFAULT_PAGE_SIZE = 50
+MIN_PAGE_SIZE = 1
+MAX_PAGE_SIZE = 100
+MAX_RESPONSE_BYTES = int(os.environ.get('MAX_RESPONSE_BYTES', 1024 * 1024))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(PAGINATION_TOKEN_SECRET, payload, hashlib.sha256).digest()
+
+
+def encode_page_token(last_evaluated_key: Optional[Dict[str, Any]], scope: str) -> Optional[str]:
+    """Wrap a LastEvaluatedKey into an opaque token, or None when there are no more pages"""
+    if not last_evaluated_key:
+        return None
+
+    payload = json.dumps({'k': last_evaluated_key, 's': scope},
+                         separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_page_token(token: str, scope: str) -> Dict[str, Any]:
+    """Verify a token and return the ExclusiveStartKey it wraps"""
+    try:
+        encoded_payload, encoded_signature = token.split('.', 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed page token") from e
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("Invalid page token signature")
+
+    data = json.loads(payload)
+    if data.get('s') != scope:
+        raise ValueError("Page token was issued for a different query")
+
+    return data['k']
+
+
+def clamp_page_size(value: Optional[str]) -> int:
+    """Parse a requested page size and clamp it to the server-side bounds"""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+
+    return max(MIN_PAGE_SIZE, min(MAX_PAGE_SIZE, int(value)))
@@ -0,0 +1,106 @@
+"""
+In-process LRU/TTL read-through cache that lives across warm Lambda invocations
+
+The question bank only changes when the ingest pipeline runs, so handlers keep
+encoded responses in memory. The ingest bumps a data version item in the table;
+caches poll it at a fixed interval and drop everything when it changes.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+# Returned by TTLCache.get on a miss; None is a valid (negative) cached value
+MISS = object()
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry TTL, negative caching and version-stamp invalidation"""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 300.0, negative_ttl: float = 30.0,
+                 version_check_interval: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.version_check_interval = version_check_interval
+        self.clock = clock
+        self.version: Optional[str] = None
+        self._version_checked_at: Optional[float] = None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value (None for a cached negative result) or MISS"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return MISS
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if value is None:
+            self.negative_hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value; None caches a negative result for the shorter negative TTL"""
+        ttl = self.negative_ttl if value is None else self.ttl
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def sync_version(self, fetch_version: Callable[[], Optional[str]]) -> None:
+        """Poll the data version at most every version_check_interval and clear on change"""
+        now = self.clock()
+        if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_interval:
+            return
+
+        version = fetch_version()
+        self._version_checked_at = now
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'version': self.version
+        }
+
+
+# Shared by the question handlers for the lifetime of the container
+question_cache = TTLCache(
+    max_entries=int(os.environ.get('QUESTION_CACHE_MAX_ENTRIES', 2048)),
+    ttl=float(os.environ.get('QUESTION_CACHE_TTL', 300)),
+    negative_ttl=float(os.environ.get('QUESTION_CACHE_NEGATIVE_TTL', 30)),
+    version_check_interval=float(os.environ.get('DATA_VERSION_CHECK_INTERVAL', 30))
+)
@@ -0,0 +1,26 @@
+"""
+Shared fixtures
+"""
+import pytest
+
+from src.models.question import Question, QuestionOption
+
+
+@pytest.fixture
+def make_questions():
+    """Factory for distinct two-option questions of one exam type, numbered from 1"""
+    def make(count, exam_type="AWS-SAA-C03", text="Which service stores objects?"):
+        questions = []
+        for number in range(1, count + 1):
+            question_text = f"{text} ({number})"
+            questions.append(Question(
+                id=Question.stable_id(exam_type, str(number), question_text),
+                question_number=str(number),
+                question_text=question_text,
+                options=[QuestionOption("A", "S3"), QuestionOption("B", "EBS")],
+                correct_count=1,
+                source_page=number,
+                exam_type=exam_type
+            ))
+        return questions
+    return make
@@ -0,0 +1,73 @@
+"""
+BulkLoader scheduling: the main loop must block, not spin, while batches wait
+"""
+import time
+
+from src.utils import bulk_loader
+from src.utils.bulk_loader import BulkLoader
+
+
+class SlowClient:
+    """batch_write_item stand-in that takes a fixed time and processes everything"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    def batch_write_item(self, RequestItems):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {'UnprocessedItems': {}}
+
+
+class PartialClient(SlowClient):
+    """Leaves the whole batch unprocessed on its first call, forcing a backoff"""
+
+    def batch_write_item(self, RequestItems):
+        response = super().batch_write_item(RequestItems)
+        if self.calls == 1:
+            return {'UnprocessedItems': RequestItems}
+        return response
+
+
+def count_waits(monkeypatch):
+    calls = []
+    real_wait = bulk_loader.wait
+
+    def counting_wait(*args, **kwargs):
+        calls.append(kwargs.get('timeout'))
+        return real_wait(*args, **kwargs)
+
+    monkeypatch.setattr(bulk_loader, 'wait', counting_wait)
+    return calls
+
+
+def put_requests(count):
+    return [{'PutRequest': {'Item': {'PK': {'S': f'QUESTION#{i}'}}}} for i in range(count)]
+
+
+def test_blocks_on_completion_when_at_concurrency_limit(monkeypatch):
+    waits = count_waits(monkeypatch)
+    client = SlowClient(delay=0.1)
+    loader = BulkLoader('table', dynamodb=client, max_workers=2, batch_size=25, progress=None)
+
+    stats = loader.write(put_requests(250))  # 10 batches over 2 workers
+
+    assert stats.written == 250
+    assert client.calls == 10
+    # One wake-up per completed batch at most, instead of thousands of zero-timeout polls
+    assert len(waits) <= 10
+    assert all(timeout is None for timeout in waits)
+
+
+def test_sleeps_until_backed_off_batch_is_due(monkeypatch):
+    waits = count_waits(monkeypatch)
+    client = PartialClient(delay=0.01)
+    loader = BulkLoader('table', dynamodb=client, max_workers=1, batch_size=25,
+                        base_delay=0.2, max_delay=0.2, progress=None)
+
+    stats = loader.write(put_requests(50))
+
+    assert stats.written == 50
+    assert stats.retried_items == 25
+    assert len(waits) <= 5
@@ -0,0 +1,60 @@
+"""
+Exam index publishing: versioned shards switch over with the metadata item and old ones are removed
+"""
+import json
+
+from benchmarks.common import mock_questions_table
+from src.handlers import assemble_exam
+from src.models import exam_index
+from src.models.exam_index import ExamIndex
+from src.utils.db_utils import DynamoDBUtils, get_data_version
+from src.utils.read_cache import question_cache
+
+EXAM_TYPE = "AWS-SAA-C03"
+
+
+def publish(utils, questions):
+    index, shards = ExamIndex.build(EXAM_TYPE, questions)
+    utils.put_exam_index(index.to_dynamodb_item(), index.shard_items(shards))
+    return index
+
+
+def index_keys(utils):
+    items = utils.dynamodb.scan(TableName=utils.table_name)['Items']
+    return {item['PK']['S'] for item in items if item['PK']['S'].startswith('EXAM_INDEX#')}
+
+
+def test_smaller_index_removes_the_old_shards(monkeypatch, make_questions):
+    monkeypatch.setattr(exam_index, 'IDS_PER_SHARD', 2)
+    questions = make_questions(6)
+    with mock_questions_table():
+        utils = DynamoDBUtils()
+        large = publish(utils, questions)
+        assert large.shard_count == 3
+
+        small = publish(utils, questions[:2])
+        assert small.version != large.version
+        assert index_keys(utils) == {ExamIndex.partition_key(EXAM_TYPE), small.shard_key(0)}
+
+
+def test_draw_from_a_replaced_index_reloads_it(monkeypatch, make_questions):
+    monkeypatch.setattr(exam_index, 'IDS_PER_SHARD', 2)
+    questions = make_questions(6)
+    with mock_questions_table():
+        utils = DynamoDBUtils()
+        utils.sync_items([q.to_dynamodb_item() for q in questions])
+
+        # A warm container cached the metadata of the index that is about to be replaced
+        question_cache.clear()
+        monkeypatch.setattr(question_cache, 'version_check_interval', 0)
+        question_cache.sync_version(lambda: get_data_version(utils.dynamodb, utils.table_name))
+        monkeypatch.setattr(question_cache, 'version_check_interval', 3600)
+        question_cache.put(('exam_index', EXAM_TYPE), publish(utils, questions))
+
+        publish(utils, questions[:4])
+        response = assemble_exam.lambda_handler(
+            {'queryStringParameters': {'exam_type': EXAM_TYPE, 'count': '6', 'seed': 'fixed'}}, None)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert {q['id'] for q in body['questions']} == {q.id for q in questions[:4]}
@@ -0,0 +1,63 @@
+"""
+Publishing exam artifacts: snapshots never go stale and caches are invalidated once
+"""
+from benchmarks.common import mock_questions_table
+from src.models.exam_index import ExamIndex
+from src.models.exam_snapshot import ExamSnapshot
+from src.services.ingest_pipeline import DynamoDBSink, QuestionBatch
+from src.services.question_service import QuestionService
+from src.utils import db_utils
+from src.utils.db_utils import DynamoDBUtils, get_data_version
+
+EXAM_TYPE = "AWS-SAA-C03"
+
+
+def get_snapshot(utils):
+    response = utils.dynamodb.get_item(TableName=utils.table_name,
+                                       Key={'PK': {'S': ExamSnapshot.partition_key(EXAM_TYPE)}})
+    return response.get('Item')
+
+
+def test_oversize_snapshot_removes_the_stale_one(monkeypatch, make_questions):
+    with mock_questions_table():
+        utils = DynamoDBUtils()
+        assert utils.put_exam_snapshot(ExamSnapshot.build(EXAM_TYPE, make_questions(2)).to_dynamodb_item())
+        assert get_snapshot(utils) is not None
+
+        monkeypatch.setattr(db_utils, 'MAX_SNAPSHOT_BYTES', 1)
+        assert not utils.put_exam_snapshot(ExamSnapshot.build(EXAM_TYPE, make_questions(3)).to_dynamodb_item())
+        assert get_snapshot(utils) is None
+
+
+def test_sync_can_leave_the_version_bump_to_the_caller(make_questions):
+    with mock_questions_table():
+        utils = DynamoDBUtils()
+        utils.sync_items([q.to_dynamodb_item() for q in make_questions(2)], bump_version=False)
+        assert get_data_version(utils.dynamodb, utils.table_name) is None
+
+        utils.sync_items([q.to_dynamodb_item() for q in make_questions(3)])
+        assert get_data_version(utils.dynamodb, utils.table_name) == '1'
+
+
+def test_sink_run_republishes_the_exam_artifacts(tmp_path, make_questions):
+    questions = make_questions(3)
+    with mock_questions_table():
+        utils = DynamoDBUtils()
+        utils.sync_items([q.to_dynamodb_item() for q in questions[:2]], bump_version=False)
+        QuestionService().publish_exam_artifacts(utils, questions[:2])
+        assert get_data_version(utils.dynamodb, utils.table_name) == '1'
+
+        # Only the new question goes through the sink; the artifacts still cover all three
+        search_index_path = tmp_path / "search_index.bin"
+        sink = DynamoDBSink(utils, search_index_path=str(search_index_path))
+        sink.write(QuestionBatch("new.pdf", "new.pdf", questions[2:]))
+        sink.close()
+
+        snapshot = ExamSnapshot.from_dynamodb_item(get_snapshot(utils))
+        assert snapshot.count == 3
+        assert snapshot.etag == ExamSnapshot.build(EXAM_TYPE, questions).etag
+        index_item = utils.dynamodb.get_item(TableName=utils.table_name,
+                                             Key={'PK': {'S': ExamIndex.partition_key(EXAM_TYPE)}})['Item']
+        assert ExamIndex.from_dynamodb_item(index_item).count == 3
+        assert search_index_path.stat().st_size > 0
+        assert get_data_version(utils.dynamodb, utils.table_name) == '2'
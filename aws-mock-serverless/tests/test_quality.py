@@ -0,0 +1,31 @@
+"""
+BatchValidator: a question header swallowed into an option is flagged however it is spaced
+"""
+import pytest
+
+from src.models.question import Question, QuestionOption
+from src.services.quality_service import BatchValidator
+
+pytest.importorskip("numpy")
+
+
+def make_question(last_option):
+    return Question(
+        id="q1",
+        question_number="1",
+        question_text="Which service stores objects?",
+        options=[QuestionOption("A", "S3"), QuestionOption("B", last_option)],
+        correct_count=1,
+        source_page=1
+    )
+
+
+@pytest.mark.parametrize("header", ["Question #12", "Question # 12"])
+def test_swallowed_header_is_flagged(header):
+    report = BatchValidator().validate([make_question(f"EBS Topic 1 {header} Which ...")])
+    assert report.failures["swallowed_header"] == ["q1"]
+
+
+def test_clean_option_is_not_flagged():
+    report = BatchValidator().validate([make_question("EBS")])
+    assert not report.failures.get("swallowed_header")